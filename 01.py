@@ -1,19 +1,101 @@
 #!/usr/bin/env python3
 
+from math import prod
+from typing import List, Optional, Sequence, Set, Tuple
+
 import aoc
 
+TARGET = 2020
+# Up to this target, non-negative pairs are searched with an integer bitset.
+BITSET_LIMIT = 1 << 24
+
+
+def two_sum(numbers: Sequence[int], target: int) -> Optional[Tuple[int, int]]:
+    seen: Set[int] = set()
+    for number in numbers:
+        if target - number in seen:
+            return target - number, number
+        seen.add(number)
+    return None
+
+
+def bitset_two_sum(numbers: Sequence[int], target: int) -> Optional[Tuple[int, int]]:
+    """two_sum for non-negative numbers, one bit per value up to target."""
+    flags = bytearray(target + 1)
+    doubled = False
+    for number in numbers:
+        if number <= target:
+            doubled = doubled or (2 * number == target and flags[number] == 1)
+            flags[number] = 1
+    digits = flags.translate(bytes.maketrans(b"\x00\x01", b"01"))
+    present = int(digits[::-1], 2)
+    # bit i of mirrored is set if target - i is present
+    mirrored = int(digits, 2)
+    candidates = present & mirrored
+    if target % 2 == 0 and not doubled:
+        candidates &= ~(1 << target // 2)
+    if not candidates:
+        return None
+    lower = (candidates & -candidates).bit_length() - 1
+    return lower, target - lower
+
+
+def sorted_k_sum(
+    ordered: List[int], start: int, k: int, target: int
+) -> Optional[Tuple[int, ...]]:
+    """Find k numbers from ordered[start:] summing to target.
+
+    Fixes the smallest number and recurses, finishing with a two-pointer scan.
+    """
+    if k == 2:
+        low, high = start, len(ordered) - 1
+        while low < high:
+            total = ordered[low] + ordered[high]
+            if total == target:
+                return ordered[low], ordered[high]
+            if total < target:
+                low += 1
+            else:
+                high -= 1
+        return None
+    for index in range(start, len(ordered) - k + 1):
+        if index > start and ordered[index] == ordered[index - 1]:
+            continue
+        if ordered[index] + sum(ordered[index + 1 : index + k]) > target:
+            break  # even the smallest remaining numbers are too large
+        if ordered[index] + sum(ordered[len(ordered) - k + 1 :]) < target:
+            continue  # even the largest remaining numbers are too small
+        rest = sorted_k_sum(ordered, index + 1, k - 1, target - ordered[index])
+        if rest is not None:
+            return (ordered[index], *rest)
+    return None
+
+
+def k_sum(numbers: Sequence[int], k: int, target: int) -> Optional[Tuple[int, ...]]:
+    """Return k entries of numbers (by position) that sum to target, if any.
+
+    Pairs take linear time, larger k O(n^(k - 1)).
+    """
+    if k < 1 or len(numbers) < k:
+        return None
+    if k == 1:
+        return (target,) if target in numbers else None
+    if k == 2:
+        if 0 <= target <= BITSET_LIMIT and min(numbers) >= 0:
+            return bitset_two_sum(numbers, target)
+        return two_sum(numbers, target)
+    return sorted_k_sum(sorted(numbers), 0, k, target)
+
 
 def main() -> None:
-    numbers = aoc.get_integers(1)
-    for lower_index, lower in enumerate(numbers):
-        for upper in numbers[lower_index:]:
-            if lower + upper == 2020:
-                print(lower * upper)
-    for lower_index, lower in enumerate(numbers):
-        for middle_index, middle in enumerate(numbers[lower_index:]):
-            for upper in numbers[middle_index:]:
-                if lower + middle + upper == 2020:
-                    print(lower * middle * upper)
+    with aoc.stage("parse"):
+        numbers = aoc.get_integers(1)
+    with aoc.stage("part1"):
+        if (pair := k_sum(numbers, 2, TARGET)) is not None:
+            print(prod(pair))
+    with aoc.stage("part2"):
+        if (triple := k_sum(numbers, 3, TARGET)) is not None:
+            print(prod(triple))
 
 
 if __name__ == "__main__":
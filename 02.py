@@ -1,35 +1,100 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Tuple
+
 import aoc
+import numpy as np
+
+
+def parse_integers(
+    data: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    """Parse the decimal numbers data[starts[i]:ends[i]] for all i at once."""
+    values = np.zeros(len(starts), dtype=np.int64)
+    for offset in range(int((ends - starts).max(initial=0))):
+        positions = starts + offset
+        inside = positions < ends
+        characters = data[np.minimum(positions, len(data) - 1)]
+        digits = characters.astype(np.int64) - ord("0")
+        values = np.where(inside, values * 10 + digits, values)
+    return values
+
+
+@dataclass
+class PasswordDatabase:
+    """One "min-max c: password" line per row, stored column by column.
+
+    The passwords stay in the raw input bytes, referenced by their offsets.
+    """
+
+    data: np.ndarray
+    minimums: np.ndarray
+    maximums: np.ndarray
+    characters: np.ndarray
+    password_starts: np.ndarray
+    password_ends: np.ndarray
+
+    @classmethod
+    def from_buffer(cls, buffer: aoc.Buffer) -> PasswordDatabase:
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        line_ends = np.flatnonzero(data == ord("\n"))
+        if len(data) and data[-1] != ord("\n"):
+            line_ends = np.append(line_ends, len(data))
+        line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+        non_empty = line_ends > line_starts
+        line_starts, line_ends = line_starts[non_empty], line_ends[non_empty]
+        dashes = np.flatnonzero(data == ord("-"))
+        colons = np.flatnonzero(data == ord(":"))
+        # the space after the maximum is the one right before the character
+        return cls(
+            data,
+            parse_integers(data, line_starts, dashes),
+            parse_integers(data, dashes + 1, colons - 2),
+            data[colons - 1],
+            colons + 2,
+            line_ends,
+        )
+
+    def character_counts(self) -> np.ndarray:
+        """How often each row's character occurs in its password."""
+        counts = np.zeros(len(self.characters), dtype=np.int64)
+        for character in np.unique(self.characters):
+            positions = np.flatnonzero(self.data == character)
+            rows = np.searchsorted(self.password_ends, positions)
+            inside = rows < len(self.characters)
+            positions, rows = positions[inside], rows[inside]
+            relevant = (self.characters[rows] == character) & (
+                positions >= self.password_starts[rows]
+            )
+            counts += np.bincount(rows[relevant], minlength=len(counts))
+        return counts
+
+    def evaluate(self) -> Tuple[int, int]:
+        """Count the passwords valid under the count and the position policy."""
+        counts = self.character_counts()
+        count_valid = (self.minimums <= counts) & (counts <= self.maximums)
+
+        first = self.password_starts + self.minimums - 1
+        last = self.password_starts + self.maximums - 1
+        in_password = last < self.password_ends
+        first = np.where(in_password, first, self.password_starts)
+        last = np.where(in_password, last, self.password_starts)
+        position_valid = in_password & (
+            (self.data[first] == self.characters) ^ (self.data[last] == self.characters)
+        )
+        return int(count_valid.sum()), int(position_valid.sum())
 
 
 def main() -> None:
-    count = 0
-    for line in aoc.get_lines(2):
-        if line:
-            password_format, password = line.split(": ")
-            amounts, character = password_format.split(" ")
-            minimal_count, maximal_count = [
-                int(number) for number in amounts.split("-")
-            ]
-            if minimal_count <= password.count(character) <= maximal_count:
-                count += 1
-    print(count)
-
-    count = 0
-    for line in aoc.get_lines(2):
-        if line:
-            password_format, password = line.split(": ")
-            positions, character = password_format.split(" ")
-            first_position, last_position = [
-                int(number) - 1 for number in positions.split("-")
-            ]
-            if len(password) > last_position and (
-                (password[first_position] == character)
-                ^ (password[last_position] == character)
-            ):
-                count += 1
-    print(count)
+    with aoc.stage("parse"):
+        database = PasswordDatabase.from_buffer(aoc.get_buffer(2))
+    with aoc.stage("part2"):
+        count_valid, position_valid = database.evaluate()
+    print(count_valid)
+    print(position_valid)
 
 
 if __name__ == "__main__":
@@ -1,33 +1,56 @@
 #!/usr/bin/env python3
 
+from itertools import chain
+from math import prod
+from typing import Dict, Iterable, List, Sequence, Tuple
+
 import aoc
 
+SLOPES = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]
+TREE_BITS = str.maketrans(".#", "01")
+
+
+def pack_row(line: str) -> int:
+    """Bit x is set if there is a tree in column x."""
+    return int(line[::-1].translate(TREE_BITS), 2)
+
+
+def count_trees(
+    rows: Iterable[int], width: int, slopes: Sequence[Tuple[int, int]]
+) -> List[int]:
+    """Count the trees hit on every slope in a single pass over the rows.
+
+    Only the current column of every slope is kept, so rows can be streamed.
+    """
+    slopes_by_dy: Dict[int, List[int]] = {}
+    for index, (_, dy) in enumerate(slopes):
+        slopes_by_dy.setdefault(dy, []).append(index)
+    columns = [0] * len(slopes)
+    tree_counts = [0] * len(slopes)
+    for y, row in enumerate(rows):
+        if y == 0:
+            continue
+        for dy, indices in slopes_by_dy.items():
+            if y % dy:
+                continue
+            for index in indices:
+                column = (columns[index] + slopes[index][0]) % width
+                columns[index] = column
+                tree_counts[index] += row >> column & 1
+    return tree_counts
+
 
 def main() -> None:
-    board = [line for line in aoc.get_lines(3) if line]
-
-    def is_tree(x: int, y: int) -> bool:
-        return board[y][x % len(board[0])] == "#"
-
-    def count_trees(dx: int, dy: int) -> int:
-        x = 0
-        y = 0
-        tree_count = 0
-        while 1:
-            x += dx
-            y += dy
-            if y >= len(board):
-                break
-            tree_count += is_tree(x, y)
-        return tree_count
-
-    accumulator = 1
-    for dx, dy in [[1, 1], [3, 1], [5, 1], [7, 1], [1, 2]]:
-        result = count_trees(dx, dy)
+    with aoc.stage("parse"):
+        lines = aoc.iter_lines(3)
+        first_line = next(lines)
+        rows = map(pack_row, chain([first_line], lines))
+
+    with aoc.stage("part2"):
+        tree_counts = count_trees(rows, len(first_line), SLOPES)
+    for (dx, dy), result in zip(SLOPES, tree_counts):
         print(f"- Right {dx}, down {dy}: {result}")
-        accumulator *= result
-
-    print(f"==> {accumulator}")
+    print(f"==> {prod(tree_counts)}")
 
 
 if __name__ == "__main__":
@@ -1,103 +1,107 @@
 #!/usr/bin/env python3
 
-from typing import Dict
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Deque, Dict, Iterator, Optional, Pattern, Tuple
 
 import aoc
 
-
-def safe_int(value: str) -> int:
-    try:
-        return int(value)
-    except:
-        return -1
-
-
-def validate_byr(data: Dict[str, str]) -> bool:
-    return len(byr := data.get("byr", "")) == 4 and 1920 <= safe_int(byr) <= 2002
-
-
-def validate_iyr(data: Dict[str, str]) -> bool:
-    return len(iyr := data.get("iyr", "")) == 4 and 2010 <= safe_int(iyr) <= 2020
-
-
-def validate_eyr(data: Dict[str, str]) -> bool:
-    return len(eyr := data.get("eyr", "")) == 4 and 2020 <= safe_int(eyr) <= 2030
-
-
-def validate_hgt(data: Dict[str, str]) -> bool:
-    if len(hgt := data.get("hgt", "")) >= 4:
-        unit = hgt[-2:]
-        value = safe_int(hgt[:-2])
-        return (
-            unit == "cm" and 150 <= value <= 193 or unit == "in" and 59 <= value <= 76
-        )
-    return False
-
-
-def validate_hcl(data: Dict[str, str]) -> bool:
-    if len(hcl := data.get("hcl", "")) == 7 and hcl[0] == "#":
-        for character in hcl[1:]:
-            if character not in "0123456789abcdef":
-                return False
-        return True
-    return False
-
-
-def validate_ecl(data: Dict[str, str]) -> bool:
-    return ((ecl := data.get("ecl", "")) != "") and ecl in [
-        "amb",
-        "blu",
-        "brn",
-        "gry",
-        "grn",
-        "hzl",
-        "oth",
-    ]
-
-
-def validate_pid(data: Dict[str, str]) -> bool:
-    return len(pid := data.get("pid", "")) == 9 and 0 <= safe_int(pid)
-
-
-def validate_cid(data: Dict[str, str]) -> bool:
-    return True
+# Every required field with the pattern its value has to match; cid is optional.
+FIELD_RULES: Dict[str, bytes] = {
+    "byr": rb"19[2-9]\d|200[0-2]",
+    "iyr": rb"201\d|2020",
+    "eyr": rb"202\d|2030",
+    "hgt": rb"(?:1[5-8]\d|19[0-3])cm|(?:59|6\d|7[0-6])in",
+    "hcl": rb"#[0-9a-f]{6}",
+    "ecl": rb"amb|blu|brn|gry|grn|hzl|oth",
+    "pid": rb"\d{9}",
+}
+# Passports are validated in chunks of about this many bytes.
+CHUNK_BYTES = 1 << 20
+
+
+def compile_validator(rules: Dict[str, bytes]) -> Pattern[bytes]:
+    """One regex matching records that contain every field, in any order."""
+    return re.compile(
+        b"".join(
+            rb"(?=(?:\S*\s)*?" + field.encode() + rb":(?:" + rule + rb")(?!\S))"
+            for field, rule in rules.items()
+        ),
+        re.DOTALL,
+    )
+
+
+COMPLETE = compile_validator({field: rb"\S*" for field in FIELD_RULES})
+VALID = compile_validator(FIELD_RULES)
+
+
+def chunk_ranges(buffer: aoc.Buffer, chunk_bytes: int) -> Iterator[Tuple[int, int]]:
+    """Split the buffer into ranges of whole records."""
+    start = 0
+    while start < len(buffer):
+        end = buffer.find(b"\n\n", start + chunk_bytes)
+        if end == -1:
+            end = len(buffer)
+        yield start, end
+        start = end + 2
+
+
+def count_passports(buffer: aoc.Buffer, start: int, end: int) -> Tuple[int, int]:
+    """Count the complete and the valid passports in buffer[start:end]."""
+    complete_count = valid_count = 0
+    for record in buffer[start:end].split(b"\n\n"):
+        if COMPLETE.match(record):
+            complete_count += 1
+            valid_count += VALID.match(record) is not None
+    return complete_count, valid_count
+
+
+def count_passports_in_file(path: Path, start: int, end: int) -> Tuple[int, int]:
+    buffer = aoc.map_file(path)
+    return count_passports(buffer, start, end)
+
+
+def count_all_passports(path: Path, workers: Optional[int] = None) -> Tuple[int, int]:
+    """Count complete and valid passports, one chunk per worker at a time.
+
+    Only a bounded number of chunks is in flight, so the file is never fully
+    read into memory.
+    """
+    buffer = aoc.map_file(path)
+    ranges = chunk_ranges(buffer, CHUNK_BYTES)
+    first_range = next(ranges, (0, 0))
+    second_range = next(ranges, None)
+    if second_range is None:
+        return count_passports(buffer, *first_range)
+
+    workers = workers or os.cpu_count() or 1
+    complete_count = valid_count = 0
+    pending: Deque["Future[Tuple[int, int]]"] = deque()
+    with ProcessPoolExecutor(workers) as executor:
+        for start, end in chain([first_range, second_range], ranges):
+            if len(pending) >= 2 * workers:
+                complete, valid = pending.popleft().result()
+                complete_count += complete
+                valid_count += valid
+            pending.append(executor.submit(count_passports_in_file, path, start, end))
+        for future in pending:
+            complete, valid = future.result()
+            complete_count += complete
+            valid_count += valid
+    return complete_count, valid_count
 
 
 def main() -> None:
-    passports = aoc.get_str(4).rstrip().split("\n\n")
-    fields = ["byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid", "cid"]
-    valid_passport_count = 0
-    for passport in passports:
-        remaining_fields = [
-            field
-            for field in fields
-            if field
-            not in [
-                field.split(":")[0] for field in passport.replace("\n", " ").split(" ")
-            ]
-        ]
-        if remaining_fields == [] or remaining_fields == ["cid"]:
-            valid_passport_count += 1
-    print(valid_passport_count)
-
-    validated_passport_count = 0
-
-    for passport in passports:
-        data = {
-            field.split(":")[0]: field.split(":")[1]
-            for field in passport.replace("\n", " ").split(" ")
-        }
-        validated_passport_count += (
-            validate_byr(data)
-            and validate_iyr(data)
-            and validate_eyr(data)
-            and validate_hgt(data)
-            and validate_hcl(data)
-            and validate_ecl(data)
-            and validate_pid(data)
-            and validate_cid(data)
-        )
-    print(validated_passport_count)
+    with aoc.stage("parse"):
+        aoc.ensure_downloaded(4)
+    with aoc.stage("part2"):
+        complete_count, valid_count = count_all_passports(aoc.cache_file_for_day(4))
+    print(complete_count)
+    print(valid_count)
 
 
 if __name__ == "__main__":
@@ -1,25 +1,38 @@
 #!/usr/bin/env python3
-from typing import List
-
 import aoc
+import numpy as np
+
+
+def decode_seat_ids(buffer: aoc.Buffer) -> np.ndarray:
+    """Decode all boarding passes at once, B and R being one bits.
+
+    Passes may have any width below 63 bits, as long as all have the same.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    printable = np.flatnonzero(data > ord(" "))
+    data = data[: printable[-1] + 1 if len(printable) else 0]
+    width = int(np.argmax(data == ord("\n"))) or len(data)
+    passes = np.append(data, np.uint8(ord("\n"))).reshape(-1, width + 1)[:, :width]
+    bits = (passes == ord("B")) | (passes == ord("R"))
+    weights = np.left_shift(1, np.arange(width - 1, -1, -1, dtype=np.int64))
+    return bits @ weights
+
+
+def find_gaps(seat_ids: np.ndarray) -> np.ndarray:
+    """Free seats whose neighbours are both taken, from an occupancy bitmap."""
+    lowest = seat_ids.min()
+    occupied = np.zeros(seat_ids.max() - lowest + 1, dtype=bool)
+    occupied[seat_ids - lowest] = True
+    return np.flatnonzero(occupied[:-2] & ~occupied[1:-1] & occupied[2:]) + lowest + 1
 
 
 def main() -> None:
-    seats = aoc.get_str(5).strip().split()
-    seat_ids: List[int] = []
-    for seat in seats:
-        row = int(seat[:7].replace("F", "0").replace("B", "1"), 2)
-        col = int(seat[7:].replace("L", "0").replace("R", "1"), 2)
-        seat_id = 8 * row + col
-        seat_ids.append(seat_id)
-    max_seat_id = max(seat_ids)
-    print(max_seat_id)
-    for seat_id in range(int(0.1 * max_seat_id), int(0.9 * max_seat_id)):
-        if (
-            seat_id - 1 in seat_ids
-            and seat_id not in seat_ids
-            and seat_id + 1 in seat_ids
-        ):
+    with aoc.stage("parse"):
+        seat_ids = decode_seat_ids(aoc.get_buffer(5))
+    with aoc.stage("part1"):
+        print(seat_ids.max())
+    with aoc.stage("part2"):
+        for seat_id in find_gaps(seat_ids):
             print(seat_id)
 
 
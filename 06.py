@@ -1,35 +1,46 @@
 #!/usr/bin/env python3
 
-import string
-from typing import Set
+from typing import Tuple
 
 import aoc
+import numpy as np
+
+
+def answer_masks(buffer: aoc.Buffer) -> Tuple[np.ndarray, np.ndarray]:
+    """Per group, the answers of anyone and of everyone as 26 bit masks."""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    printable = np.flatnonzero(data > ord(" "))
+    data = np.append(
+        data[: printable[-1] + 1 if len(printable) else 0], np.uint8(ord("\n"))
+    )
+    letters = (ord("a") <= data) & (data <= ord("z"))
+    shifts = np.where(letters, data - ord("a"), 0).astype(np.uint32)
+    bits = np.where(letters, np.left_shift(np.uint32(1), shifts), np.uint32(0))
+
+    line_ends = np.flatnonzero(data == ord("\n"))
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    blank = line_starts == line_ends
+    # newlines and blank lines have no bits, so they do not affect the masks
+    person_masks = np.bitwise_or.reduceat(bits, line_starts[~blank])
+    group_ids = np.cumsum(blank)[~blank]
+    group_starts = np.flatnonzero(np.diff(group_ids, prepend=-1))
+    return (
+        np.bitwise_or.reduceat(person_masks, group_starts),
+        np.bitwise_and.reduceat(person_masks, group_starts),
+    )
+
+
+def popcount_sum(masks: np.ndarray) -> int:
+    return int(np.unpackbits(masks.view(np.uint8)).sum())
 
 
 def main() -> None:
-    groups = aoc.get_str(6).strip().split("\n\n")
-
-    accumulator = 0
-    for group in groups:
-        found_characters: Set[str] = set()
-        for character in group:
-            if character in string.ascii_lowercase:
-                found_characters.add(character)
-        accumulator += len(found_characters)
-    print(accumulator)
-
-    accumulator = 0
-    for group in groups:
-        lines = group.split("\n")
-        all_characters = [
-            character for character in lines[0] if character in string.ascii_lowercase
-        ]
-        for line in lines[1:]:
-            for character in list(all_characters):
-                if character not in line:
-                    all_characters.remove(character)
-        accumulator += len(all_characters)
-    print(accumulator)
+    with aoc.stage("parse"):
+        buffer = aoc.get_buffer(6)
+    with aoc.stage("part2"):
+        anyone, everyone = answer_masks(buffer)
+    print(popcount_sum(anyone))
+    print(popcount_sum(everyone))
 
 
 if __name__ == "__main__":
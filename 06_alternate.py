@@ -1,15 +1,29 @@
 #!/usr/bin/env python3
 
 import string
-from typing import Set
+from functools import reduce
+from operator import and_, or_
 
 import aoc
 
+BITS = {c: 1 << i for i, c in enumerate(string.ascii_lowercase)}
+
+
+def mask(answers: str) -> int:
+    return reduce(or_, map(BITS.__getitem__, answers), 0)
+
 
 def main() -> None:
-    groups = aoc.get_str(6).strip().split("\n\n")
-    print(sum([len({c for c in g if c != "\n"}) for g in groups]))
-    print(sum(len(set.intersection(*[set(l) for l in g.split("\n")])) for g in groups))
+    with aoc.stage("parse"):
+        groups = aoc.get_str(6).strip().split("\n\n")
+    with aoc.stage("part2"):
+        anyone = everyone = 0
+        for g in groups:
+            masks = [mask(l) for l in g.split("\n")]
+            anyone += bin(reduce(or_, masks)).count("1")
+            everyone += bin(reduce(and_, masks)).count("1")
+    print(anyone)
+    print(everyone)
 
 
 if __name__ == "__main__":
@@ -1,60 +1,152 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 import aoc
-from cached_property import cached_property
 
+QUERIES = ["shiny gold"]
 
-class Rule:
-    # class variable
-    all_rules: Dict[str, Rule] = {}
 
-    child_rule_specs: List[Tuple[int, str]]
+def group_edges(sources: Sequence[int], node_count: int) -> Tuple[array, array]:
+    """Sort edges by source with a counting sort.
 
-    @cached_property
-    def child_rules(self) -> List[Tuple[int, Rule]]:
-        return [
-            (chile_rule_spec[0], Rule.all_rules[chile_rule_spec[1]])
-            for chile_rule_spec in self.child_rule_specs
-        ]
+    The edges of node n are edge_order[offsets[n]:offsets[n + 1]].
+    """
+    degrees = [0] * (node_count + 1)
+    for source in sources:
+        degrees[source + 1] += 1
+    offsets = array("q", accumulate(degrees))
+    positions = offsets[:-1]
+    edge_order = array("q", bytes(8 * len(sources)))
+    for edge, source in enumerate(sources):
+        edge_order[positions[source]] = edge
+        positions[source] += 1
+    return offsets, edge_order
+
+
+@dataclass
+class BagGraph:
+    """Bag rules with colours interned to integer ids.
+
+    Edges are stored in both directions as compressed adjacency arrays.
+    """
+
+    colors: List[str]
+    ids: Dict[str, int]
+    child_offsets: array
+    children: array
+    child_counts: array
+    parent_offsets: array
+    parents: array
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> BagGraph:
+        colors: List[str] = []
+        ids: Dict[str, int] = {}
 
-    @cached_property
-    def contains_shiny_gold(self) -> bool:
-        for _, child_rule in self.child_rules:
-            if child_rule.color == "shiny gold" or child_rule.contains_shiny_gold:
-                return True
-        return False
-
-    @cached_property
-    def contained_bags(self) -> int:
-        return sum(
-            [factor + factor * rule.contained_bags for factor, rule in self.child_rules]
+        def intern(color: str) -> int:
+            if (color_id := ids.get(color)) is None:
+                color_id = ids[color] = len(colors)
+                colors.append(color)
+            return color_id
+
+        edge_parents: List[int] = []
+        edge_children: List[int] = []
+        edge_counts: List[int] = []
+        for line in lines:
+            color, children = line.split(" contain ")
+            parent = intern(color.rsplit(" ", 1)[0])
+            for child in children.split(", "):
+                if "no other" in child:
+                    break
+                specifier = child.rsplit(" ", 1)[0]
+                amount, color = specifier.split(" ", 1)
+                if amount in ["0", "no"]:
+                    break
+                edge_parents.append(parent)
+                edge_children.append(intern(color))
+                edge_counts.append(int(amount))
+
+        child_offsets, child_order = group_edges(edge_parents, len(colors))
+        parent_offsets, parent_order = group_edges(edge_children, len(colors))
+        return cls(
+            colors,
+            ids,
+            child_offsets,
+            array("q", (edge_children[edge] for edge in child_order)),
+            array("q", (edge_counts[edge] for edge in child_order)),
+            parent_offsets,
+            array("q", (edge_parents[edge] for edge in parent_order)),
         )
 
-    color: str
+    def leaves_first(self) -> List[int]:
+        """All colours, each after every colour it contains (Kahn's algorithm)."""
+        remaining = [
+            self.child_offsets[node + 1] - self.child_offsets[node]
+            for node in range(len(self.colors))
+        ]
+        order = [node for node, count in enumerate(remaining) if count == 0]
+        for node in order:  # order grows while it is iterated
+            start, end = self.parent_offsets[node], self.parent_offsets[node + 1]
+            for parent in self.parents[start:end]:
+                remaining[parent] -= 1
+                if remaining[parent] == 0:
+                    order.append(parent)
+        if len(order) != len(self.colors):
+            raise ValueError("The bag rules contain a cycle.")
+        return order
+
+    def container_counts(self, queries: Sequence[str]) -> List[int]:
+        """For every query colour, how many colours can eventually contain it."""
+        query_bits = [0] * len(self.colors)
+        for index, query in enumerate(queries):
+            query_bits[self.ids[query]] |= 1 << index
+        # bit i of contained[node] is set if node eventually contains query i
+        contained = [0] * len(self.colors)
+        counts = [0] * len(queries)
+        for node in self.leaves_first():
+            start, end = self.child_offsets[node], self.child_offsets[node + 1]
+            mask = 0
+            for child in self.children[start:end]:
+                mask |= contained[child] | query_bits[child]
+            contained[node] = mask
+            while mask:
+                lowest = mask & -mask
+                counts[lowest.bit_length() - 1] += 1
+                mask ^= lowest
+        return counts
+
+    def contained_bag_counts(self, queries: Sequence[str]) -> List[int]:
+        """For every query colour, how many bags a bag of it holds in total."""
+        inside = [0] * len(self.colors)
+        for node in self.leaves_first():
+            start, end = self.child_offsets[node], self.child_offsets[node + 1]
+            inside[node] = sum(
+                count * (1 + inside[child])
+                for child, count in zip(
+                    self.children[start:end], self.child_counts[start:end]
+                )
+            )
+        return [inside[self.ids[query]] for query in queries]
+
 
-    def __init__(self, line: str):
-        color, children = line.split(" contain ")
-        self.color = color.rsplit(" ", 1)[0]
-        self.child_rule_specs = []
-        for child in children.split(", "):
-            if "no other" in child:
-                break
-            specifier = child.rsplit(" ", 1)[0]
-            amount, color = specifier.split(" ", 1)
-            if amount in ["0", "no"]:
-                break
-            self.child_rule_specs.append((int(amount), color))
-        Rule.all_rules[self.color] = self
+def parse_input(day: int) -> BagGraph:
+    return BagGraph.from_lines(aoc.get_lines(day))
 
 
 def main() -> None:
-    for line in aoc.get_lines(7):
-        Rule(line)
-    print(len([rule for rule in Rule.all_rules.values() if rule.contains_shiny_gold]))
-    print(Rule.all_rules["shiny gold"].contained_bags)
+    with aoc.stage("parse"):
+        graph = aoc.cached_parse(7, parse_input)
+    with aoc.stage("part1"):
+        for count in graph.container_counts(QUERIES):
+            print(count)
+    with aoc.stage("part2"):
+        for count in graph.contained_bag_counts(QUERIES):
+            print(count)
 
 
 if __name__ == "__main__":
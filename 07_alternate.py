@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 
 import aoc
 import regex
@@ -9,21 +9,67 @@ from cached_property import cached_property
 
 
 class Graph:
-    rules: Dict[str, Rule] = {}
+    rules: Dict[str, Rule]
+    # for every color, the colors of the rules directly containing it
+    parents: Dict[str, Set[str]]
 
     def __init__(self, description: str):
+        self.rules = {}
+        self.parents = {}
+        # nothing is cached yet, so there is nothing to invalidate
         for line in description.split("\n"):
-            rule = Rule(line, self)
-            self.rules[rule.color] = rule
+            self.insert(Rule(line, self))
+
+    def rule(self, color: str) -> Rule:
+        """The rule for color; colors without one are empty bags."""
+        if (rule := self.rules.get(color)) is None:
+            rule = Rule(f"{color} bags contain no other bags.", self)
+        return rule
+
+    def set_rule(self, line: str) -> Rule:
+        """Add a rule or replace the one for the same color."""
+        rule = Rule(line, self)
+        if rule.color in self.rules:
+            self.remove_rule(rule.color)
+        self.insert(rule)
+        self.invalidate(rule.color)
+        return rule
+
+    def insert(self, rule: Rule) -> None:
+        self.rules[rule.color] = rule
+        for color in rule.children_specs:
+            self.parents.setdefault(color, set()).add(rule.color)
+
+    def remove_rule(self, color: str) -> None:
+        rule = self.rules.pop(color)
+        for child_color in rule.children_specs:
+            self.parents[child_color].discard(color)
+        self.invalidate(color)
+
+    def invalidate(self, color: str) -> None:
+        """Drop the cached values of color and of every rule containing it."""
+        stack = [color]
+        seen = {color}
+        while stack:
+            color = stack.pop()
+            if (rule := self.rules.get(color)) is not None:
+                for name in Rule.cached_names:
+                    rule.__dict__.pop(name, None)
+            for parent in self.parents.get(color, ()):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
 
 
 class Rule:
+    cached_names = ["children", "contains_shiny_gold", "contained_bags"]
+
     children_specs: Dict[str, int]
 
     @cached_property
-    def children(self) -> List[Tuple[Rule, 1]]:
+    def children(self) -> List[Tuple[Rule, int]]:
         return [
-            (self.graph.rules[color], count)
+            (self.graph.rule(color), count)
             for color, count in self.children_specs.items()
         ]
 
@@ -44,7 +90,7 @@ class Rule:
     graph: Graph
 
     def __init__(self, line: str, graph: Graph):
-        self.graph = Graph
+        self.graph = graph
         match = regex.fullmatch(
             r"^([a-z ]+?) bags contain (?:(no|\d+) ([a-z ]+?) bags?(?:\.$|, ))+",
             line,
@@ -57,9 +103,12 @@ class Rule:
 
 
 def main() -> None:
-    graph = Graph(aoc.get_str(7).strip())
-    print(len([rule for rule in graph.rules.values() if rule.contains_shiny_gold]))
-    print(graph.rules["shiny gold"].contained_bags)
+    with aoc.stage("parse"):
+        graph = Graph(aoc.get_str(7).strip())
+    with aoc.stage("part1"):
+        print(len([rule for rule in graph.rules.values() if rule.contains_shiny_gold]))
+    with aoc.stage("part2"):
+        print(graph.rules["shiny gold"].contained_bags)
 
 
 if __name__ == "__main__":
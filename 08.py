@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
-from typing import List, Set
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
 
 import aoc
 
+ACC, JMP, NOP = range(3)
+OPCODES = {"acc": ACC, "jmp": JMP, "nop": NOP}
+
 
 class Instruction:
     opcode: str
@@ -30,6 +35,12 @@ class Instruction:
         else:
             print(f"WARNING: OPCODE <{self.opcode}> now known!")
 
+    def successor(self, index: int, toggled: bool = False) -> int:
+        """The instruction executed after this one at index."""
+        if (self.opcode == "jmp") != (toggled and self.opcode in ["jmp", "nop"]):
+            return index + self.value
+        return index + 1
+
     def toggle(self) -> bool:
         if self.opcode == "nop":
             self.opcode = "jmp"
@@ -40,6 +51,42 @@ class Instruction:
         return False
 
 
+@dataclass
+class DecodedProgram:
+    """A program as integer opcode and operand arrays, for fast execution."""
+
+    opcodes: array
+    operands: array
+
+    def run(self, counters: Optional[List[int]] = None) -> Tuple[bool, int]:
+        """Run until the program ends or an instruction would run twice.
+
+        Returns whether the program ended and the accumulator; jumping before
+        the first instruction does not end it. If given, counters[opcode] is
+        incremented for every executed instruction.
+        """
+        opcodes, operands = self.opcodes, self.operands
+        count = len(opcodes)
+        visited = bytearray(count)
+        instruction_pointer = accumulator = 0
+        while instruction_pointer < count:
+            if instruction_pointer < 0:
+                return False, accumulator
+            if visited[instruction_pointer]:
+                return False, accumulator
+            visited[instruction_pointer] = 1
+            opcode = opcodes[instruction_pointer]
+            if counters is not None:
+                counters[opcode] += 1
+            if opcode == JMP:
+                instruction_pointer += operands[instruction_pointer]
+            else:
+                if opcode == ACC:
+                    accumulator += operands[instruction_pointer]
+                instruction_pointer += 1
+        return True, accumulator
+
+
 class CPU:
     instruction_pointer: int
     accumulator: int
@@ -58,12 +105,25 @@ class CPU:
 
     def run(self) -> bool:
         while self.instruction_pointer < len(self.instructions):
-            if self.instruction_pointer in self.visited_instructions:
+            if (
+                self.instruction_pointer < 0
+                or self.instruction_pointer in self.visited_instructions
+            ):
                 return False
             self.visited_instructions.add(self.instruction_pointer)
             self.instructions[self.instruction_pointer].evaluate()
         return True
 
+    def decode(self) -> DecodedProgram:
+        opcodes = array("b")
+        for instruction in self.instructions:
+            if (opcode := OPCODES.get(instruction.opcode)) is None:
+                print(f"WARNING: OPCODE <{instruction.opcode}> now known!")
+                opcode = NOP
+            opcodes.append(opcode)
+        operands = array("q", (instruction.value for instruction in self.instructions))
+        return DecodedProgram(opcodes, operands)
+
     def try_fix(self, index: int) -> bool:
         if (instruction := self.instructions[index]).toggle():
             self.reset()
@@ -72,15 +132,67 @@ class CPU:
             instruction.toggle()
         return False
 
+    def terminating_instructions(self) -> List[bool]:
+        """Which instructions lead to the end of the program, unmodified.
+
+        Walks the control flow graph backwards from the end.
+        """
+        count = len(self.instructions)
+        predecessors: List[List[int]] = [[] for _ in range(count)]
+        terminates = [False] * count
+        pending: List[int] = []
+        for index, instruction in enumerate(self.instructions):
+            successor = instruction.successor(index)
+            if successor >= count:
+                terminates[index] = True
+                pending.append(index)
+            elif successor >= 0:
+                predecessors[successor].append(index)
+        while pending:
+            for predecessor in predecessors[pending.pop()]:
+                if not terminates[predecessor]:
+                    terminates[predecessor] = True
+                    pending.append(predecessor)
+        return terminates
+
+    def repair(self) -> Optional[int]:
+        """Toggle the one instruction that makes the program terminate.
+
+        Follows the looping program and toggles the first instruction whose
+        toggled successor leads to the end, so the repair takes linear time.
+        Returns the index of the toggled instruction.
+        """
+        terminates = self.terminating_instructions()
+        count = len(self.instructions)
+        visited: Set[int] = set()
+        index = 0
+        while 0 <= index < count and index not in visited:
+            visited.add(index)
+            instruction = self.instructions[index]
+            successor = instruction.successor(index, toggled=True)
+            if successor != instruction.successor(index) and (
+                successor >= count or 0 <= successor and terminates[successor]
+            ):
+                instruction.toggle()
+                return index
+            index = instruction.successor(index)
+        return None
+
+
+def parse_input(day: int) -> CPU:
+    return CPU(aoc.get_lines(day))
+
 
 def main() -> None:
-    cpu = CPU(aoc.get_lines(8))
-    cpu.run()
-    print(f"Found with at accumulator at {cpu.accumulator}.")
-    for index in range(len(cpu.instructions)):
-        if cpu.try_fix(index):
-            break
-    print(f"FOUND: Instruction #{index}, accumulator is now {cpu.accumulator}.")
+    with aoc.stage("parse"):
+        cpu = aoc.cached_parse(8, parse_input)
+    with aoc.stage("part1"):
+        _, accumulator = cpu.decode().run()
+        print(f"Found with at accumulator at {accumulator}.")
+    with aoc.stage("part2"):
+        index = cpu.repair()
+        _, accumulator = cpu.decode().run()
+        print(f"FOUND: Instruction #{index}, accumulator is now {accumulator}.")
 
 
 if __name__ == "__main__":
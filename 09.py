@@ -1,41 +1,92 @@
 #!/usr/bin/env python3
 
-from itertools import combinations
-from typing import List, Set
+from collections import deque
+from itertools import accumulate
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 
 import aoc
-from more_itertools import pairwise
+
+PREAMBLE = 25
+
+
+def find_invalid(
+    numbers: Iterable[int], preamble: int = PREAMBLE
+) -> Optional[Tuple[int, int]]:
+    """Index and value of the first number that is no sum of two predecessors.
+
+    The sums of all pairs in the window are kept in a multiset that is updated
+    in O(preamble) per number, so the numbers can be streamed.
+    """
+    window: Deque[int] = deque()
+    window_sums: Dict[int, int] = {}
+    for index, number in enumerate(numbers):
+        if len(window) == preamble:
+            if number not in window_sums:
+                return index, number
+            oldest = window.popleft()
+            for other in window:
+                pair_sum = oldest + other
+                if (count := window_sums[pair_sum]) == 1:
+                    del window_sums[pair_sum]
+                else:
+                    window_sums[pair_sum] = count - 1
+        for other in window:
+            pair_sum = number + other
+            window_sums[pair_sum] = window_sums.get(pair_sum, 0) + 1
+        window.append(number)
+    return None
+
+
+def find_range(numbers: List[int], target: int) -> Optional[Tuple[int, int]]:
+    """The first ending range of at least two numbers summing to target.
+
+    Of the ranges ending there, the shortest is returned. Ranges are
+    differences of prefix sums. Without negative numbers the start only moves
+    forward, so a two-pointer scan finds it. Otherwise the latest position of
+    every prefix sum at least two numbers back is looked up.
+    """
+    prefix_sums = [0, *accumulate(numbers)]
+    if min(numbers, default=0) >= 0:
+        start = 0
+        for stop, prefix_sum in enumerate(prefix_sums):
+            while start < stop and prefix_sum - prefix_sums[start] > target:
+                start += 1
+            # skip zeros, as later starts with the same prefix sum are shorter
+            while start < stop - 2 and prefix_sums[start + 1] == prefix_sums[start]:
+                start += 1
+            if stop - start >= 2 and prefix_sum - prefix_sums[start] == target:
+                return start, stop
+        return None
+    latest_start: Dict[int, int] = {}
+    for stop in range(2, len(prefix_sums)):
+        latest_start[prefix_sums[stop - 2]] = stop - 2
+        if (start := latest_start.get(prefix_sums[stop] - target)) is not None:
+            return start, stop
+    return None
 
 
 def main() -> None:
-    numbers = aoc.get_integers(9)
-
-    stack: List[int] = []
-    for index, (appending_number, number) in enumerate(pairwise(numbers)):
-        stack.append(appending_number)
-        if len(stack) < 25:
-            continue
-        if len(stack) > 25:
-            stack.pop(0)
-
-        if any(a + b == number for a, b in combinations(stack, 2)):
-            continue
-
-        print(f"No combination found for {number} (#{index}).")
-
-        target = number
-
-        for length in range(2, len(numbers)):
-            for start_index in range(len(numbers) - length + 1):
-                segment = numbers[start_index : start_index + length]
-                if sum(segment) == target:
-                    print(
-                        f"Found range {segment} "
-                        f"at [{start_index} : {start_index + length}) "
-                        f"length ({length})."
-                    )
-                    weakness = min(segment) + max(segment)
-                    print(f"The weakness is {weakness}.")
+    with aoc.stage("parse"):
+        numbers = aoc.get_integers(9)
+
+    with aoc.stage("part1"):
+        if (invalid := find_invalid(numbers)) is None:
+            return
+        index, target = invalid
+        print(f"No combination found for {target} (#{index}).")
+
+    with aoc.stage("part2"):
+        if (found := find_range(numbers, target)) is None:
+            return
+        start, stop = found
+        segment = numbers[start:stop]
+        print(
+            f"Found range {segment} "
+            f"at [{start} : {stop}) "
+            f"length ({stop - start})."
+        )
+        weakness = min(segment) + max(segment)
+        print(f"The weakness is {weakness}.")
 
 
 if __name__ == "__main__":
@@ -1,27 +1,86 @@
 #!/usr/bin/env python3
 
+import os
+import sys
+from collections import deque
+from itertools import compress
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
 import aoc
-import more_itertools
+
+MAX_GAP = 3
+# Counts the arrangements modulo this number if set, as exact counts of large
+# inputs have thousands of digits.
+MODULUS = (
+    int(os.environ["AOC_ARRANGEMENT_MODULUS"])
+    if os.environ.get("AOC_ARRANGEMENT_MODULUS")
+    else None
+)
+
+
+def sorted_joltages(adapters: Iterable[int], max_gap: int = MAX_GAP) -> Iterator[int]:
+    """The outlet, the adapters and the device in ascending order.
+
+    Sorted with a counting sort, as joltages are small non-negative integers.
+    """
+    flags = bytearray()
+    for adapter in adapters:
+        if adapter >= len(flags):
+            flags.extend(bytes(adapter + 1 - len(flags)))
+        flags[adapter] = 1
+    if not flags:
+        flags.append(0)
+    flags[0] = 1
+    yield from compress(range(len(flags)), flags)
+    yield len(flags) - 1 + max_gap
+
+
+def jump_counts(joltages: Iterable[int], max_gap: int = MAX_GAP) -> List[int]:
+    """jumps[gap] is how often consecutive joltages differ by gap."""
+    jumps = [0] * (max_gap + 1)
+    iterator = iter(joltages)
+    previous = next(iterator)
+    for joltage in iterator:
+        if joltage - previous > max_gap:
+            raise ValueError(f"No adapter between {previous} and {joltage} jolts.")
+        jumps[joltage - previous] += 1
+        previous = joltage
+    return jumps
+
+
+def arrangement_count(
+    joltages: Iterable[int], max_gap: int = MAX_GAP, modulus: Optional[int] = None
+) -> int:
+    """How many chains lead from the first to the last joltage.
+
+    Only the counts of the joltages within max_gap of the current one are kept,
+    in a sliding window. With a modulus, the count is computed modulo it.
+    """
+    iterator = iter(joltages)
+    window: Deque[Tuple[int, int]] = deque([(next(iterator), 1)])
+    window_total = ways = 1
+    for joltage in iterator:
+        while window and window[0][0] < joltage - max_gap:
+            window_total -= window.popleft()[1]
+        if modulus is not None:
+            window_total %= modulus
+        ways = window_total
+        window.append((joltage, ways))
+        window_total += ways
+    return ways
 
 
 def main() -> None:
-    numbers = aoc.get_integers(10)
-    numbers.sort()
-    numbers = [0, *numbers, max(numbers) + 3]
-    jumps = [0, 0, 0, 0]
-    for a, b in more_itertools.pairwise(numbers):
-        jumps[b - a] += 1
-    print(jumps[1] * jumps[3])
-
-    ways_to_reach = {0: 1}
-    for number in numbers[1:]:
-        way_count = 0
-        keys = ways_to_reach.keys()
-        for delta in [1, 2, 3]:
-            if (target_number := number - delta) in keys:
-                way_count += ways_to_reach[target_number]
-        ways_to_reach[number] = way_count
-    print(way_count)
+    with aoc.stage("parse"):
+        joltages = list(sorted_joltages(aoc.iter_integers(10)))
+    with aoc.stage("part1"):
+        jumps = jump_counts(joltages)
+        print(jumps[1] * jumps[3])
+
+    with aoc.stage("part2"):
+        # exact counts can exceed the default int to str limit of 4300 digits
+        sys.set_int_max_str_digits(0)
+        print(arrangement_count(joltages, modulus=MODULUS))
 
 
 if __name__ == "__main__":
@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
-import itertools
+import multiprocessing
+import os
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Tuple, Union
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Barrier
+from typing import List, Optional, Tuple, Union
 
 import aoc
+import numpy as np
+
+# one of every pair of opposite directions
+HALF_DIRECTIONS = [(1, 0), (0, 1), (1, 1), (-1, 1)]
+# "dense" steps every seat, "frontier" only the seats near the last changes and
+# "parallel" steps bands of seats in worker processes.
+MODE = os.environ.get("AOC_SEATING_MODE", "dense")
+# Frontiers touching more than this fraction of the seats are updated densely.
+DENSE_FRONTIER_FRACTION = 8
 
 
 class Seat(str, Enum):
@@ -130,30 +143,368 @@ class Board:
         return sum(seat == Seat.OCCUPIED for line in self.board for seat in line)
 
 
+def apply_rule(
+    occupied: np.ndarray,
+    counts: np.ndarray,
+    tolerance: int,
+    seats: Union[np.ndarray, bool],
+    out: np.ndarray,
+    check_alternation: bool = False,
+) -> int:
+    """Write the next occupation to out and return how many seats changed.
+
+    Free seats without occupied neighbors get taken, occupied seats with at
+    least tolerance occupied neighbors are left. With check_alternation, out
+    has to hold the occupation before the current one; layouts that keep
+    flipping between two states are rejected instead of stepped forever.
+    """
+    following = seats & (counts == 0) | (occupied != 0) & (counts < tolerance)
+    changed = int(np.count_nonzero(following != occupied))
+    if changed and check_alternation and np.array_equal(following, out):
+        raise ValueError("The seats alternate between two layouts forever.")
+    out[...] = following
+    return changed
+
+
+@dataclass
+class Band:
+    """The seats start to stop of the shared seat arrays, stepped by one worker.
+
+    The shared arrays are the (8, seat_count) neighbor index, both occupation
+    buffers with their "no seat" element and per buffer and worker the changed
+    seat count and whether the band repeats the state of two steps ago.
+    """
+
+    index_name: str
+    index_dtype: str
+    occupied_name: str
+    statistics_name: str
+    seat_count: int
+    worker_count: int
+    worker: int
+    start: int
+    stop: int
+    tolerance: int
+
+
+def settle_band(band: Band, barrier: Barrier) -> None:
+    """Step one band until no band changes, with a barrier per step.
+
+    Seats outside the band, the halo, are read from the other workers' rows of
+    the shared buffer once everybody passed the barrier. The first worker stores
+    the step count and whether the layouts alternate in the statistics.
+    """
+    memories = [
+        SharedMemory(name)
+        for name in [band.index_name, band.occupied_name, band.statistics_name]
+    ]
+    try:
+        index = np.ndarray(
+            (8, band.seat_count), dtype=band.index_dtype, buffer=memories[0].buf
+        )[:, band.start : band.stop]
+        buffers = np.ndarray(
+            (2, band.seat_count + 1), dtype=np.uint8, buffer=memories[1].buf
+        )
+        statistics = np.ndarray(
+            (2, band.worker_count + 1, 2), dtype=np.int64, buffer=memories[2].buf
+        )
+        counts = np.empty(band.stop - band.start, dtype=np.uint8)
+        visible = np.empty_like(counts)
+        step = 0
+        while True:
+            step += 1
+            current, following = buffers[(step - 1) % 2], buffers[step % 2]
+            counts.fill(0)
+            for neighbors in index:
+                np.take(current, neighbors, out=visible)
+                counts += visible
+            occupied = current[band.start : band.stop]
+            new = (counts == 0) | (occupied != 0) & (counts < band.tolerance)
+            statistics[step % 2, band.worker] = (
+                np.count_nonzero(new != occupied),
+                np.array_equal(new, following[band.start : band.stop]),
+            )
+            following[band.start : band.stop] = new
+            barrier.wait()
+            changed, repeated = statistics[step % 2, : band.worker_count].T
+            alternating = step > 1 and bool(repeated.all())
+            if not changed.any() or alternating:
+                if band.worker == 0:
+                    statistics[0, band.worker_count] = step, alternating
+                return
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        del index, buffers, statistics
+        for memory in memories:
+            memory.close()
+
+
+class SeatGrid:
+    """The seat map as arrays, for large maps.
+
+    seats marks the cells with a seat, occupied the taken ones as 0 or 1.
+    """
+
+    seats: np.ndarray
+    occupied: np.ndarray
+
+    def __init__(self, grid: str):
+        lines = grid.split("\n")
+        cells = np.frombuffer("".join(lines).encode(), dtype=np.uint8)
+        cells = cells.reshape(len(lines), -1)
+        self.seats = cells != ord(Seat.FLOOR.value)
+        self.occupied = (cells == ord(Seat.OCCUPIED.value)).astype(np.uint8)
+
+    def settle_adjacent(self, tolerance: int = 4) -> Tuple[int, int]:
+        """Step with the adjacent neighbor rule until nothing changes.
+
+        Neighbors are counted by summing shifted views of a zero-padded grid.
+        Returns the number of steps and the final number of occupied seats.
+        """
+        height, width = self.seats.shape
+        current = np.zeros((height + 2, width + 2), dtype=np.uint8)
+        following = np.zeros_like(current)
+        current[1:-1, 1:-1] = self.occupied
+        counts = np.empty((height, width), dtype=np.uint8)
+        step = 0
+        while True:
+            step += 1
+            counts.fill(0)
+            for dy in range(3):
+                for dx in range(3):
+                    if dx != 1 or dy != 1:
+                        counts += current[dy : dy + height, dx : dx + width]
+            changed = apply_rule(
+                current[1:-1, 1:-1],
+                counts,
+                tolerance,
+                self.seats,
+                following[1:-1, 1:-1],
+                step > 1,
+            )
+            current, following = following, current
+            if not changed:
+                return step, int(current.sum())
+
+    def adjacent_index(self) -> np.ndarray:
+        """index[d, s] is the seat next to seat s in direction d.
+
+        Numbered like line_of_sight_index, floor yields the number of seats.
+        """
+        ys, xs = np.nonzero(self.seats)
+        seat_count = len(xs)
+        dtype = np.int32 if seat_count < 2**31 else np.int64
+        height, width = self.seats.shape
+        seat_ids = np.full((height + 2, width + 2), seat_count, dtype=dtype)
+        seat_ids[1:-1, 1:-1][self.seats] = np.arange(seat_count, dtype=dtype)
+        index = np.empty((8, seat_count), dtype=dtype)
+        for direction, (dx, dy) in enumerate(HALF_DIRECTIONS):
+            index[2 * direction] = seat_ids[ys + 1 + dy, xs + 1 + dx]
+            index[2 * direction + 1] = seat_ids[ys + 1 - dy, xs + 1 - dx]
+        return index
+
+    def line_of_sight_index(self) -> np.ndarray:
+        """index[d, s] is the first seat seat s sees in direction d.
+
+        Seats are numbered in row-major order; seeing no seat yields the
+        number of seats. Along every line of sight, sorting the seats makes
+        consecutive seats see each other.
+        """
+        ys, xs = np.nonzero(self.seats)
+        seat_count = len(xs)
+        dtype = np.int32 if seat_count < 2**31 else np.int64
+        index = np.full((8, seat_count), seat_count, dtype=dtype)
+        for pair, (dx, dy) in enumerate(HALF_DIRECTIONS):
+            # the line a seat is on and its position along that line
+            line = ys if dy == 0 else xs - dx * ys
+            position = xs if dy == 0 else ys
+            order = np.lexsort((position, line)).astype(dtype)
+            sorted_lines = line[order]
+            same_line = sorted_lines[1:] == sorted_lines[:-1]
+            earlier, later = order[:-1][same_line], order[1:][same_line]
+            index[2 * pair, earlier] = later
+            index[2 * pair + 1, later] = earlier
+        return index
+
+    def settle_visible(self, tolerance: int = 5) -> Tuple[int, int]:
+        """Step with the line of sight rule until nothing changes.
+
+        Returns the number of steps and the final number of occupied seats.
+        """
+        index = self.line_of_sight_index()
+        seat_count = index.shape[1]
+        # the extra last element is the never occupied "no seat"
+        current = np.zeros(seat_count + 1, dtype=np.uint8)
+        following = np.zeros_like(current)
+        current[:-1] = self.occupied[self.seats]
+        counts = np.empty(seat_count, dtype=np.uint8)
+        visible = np.empty(seat_count, dtype=np.uint8)
+        step = 0
+        while True:
+            step += 1
+            counts.fill(0)
+            for neighbors in index:
+                np.take(current, neighbors, out=visible)
+                counts += visible
+            changed = apply_rule(
+                current[:-1], counts, tolerance, True, following[:-1], step > 1
+            )
+            current, following = following, current
+            if not changed:
+                return step, int(current.sum())
+
+    def settle_frontier(self, index: np.ndarray, tolerance: int) -> Tuple[int, int]:
+        """Step until nothing changes, only re-checking seats near changes.
+
+        index is adjacent_index or line_of_sight_index. The occupied neighbor
+        counts are updated from the seats that flipped, and only those seats
+        and their neighbors can flip in the next step, so a step costs time
+        proportional to the number of changes.
+        Returns the number of steps and the final number of occupied seats.
+        """
+        seat_count = index.shape[1]
+        # the extra last elements belong to the never occupied "no seat"
+        occupied = np.zeros(seat_count + 1, dtype=np.uint8)
+        occupied[:-1] = self.occupied[self.seats]
+        counts = np.zeros(seat_count + 1, dtype=np.int16)
+        for neighbors in index:
+            counts[:-1] += occupied[neighbors]
+        # None stands for all seats, which are handled with views instead
+        frontier: Optional[np.ndarray] = None
+        flipped = previous_flipped = np.arange(0)
+        step = 0
+        while True:
+            step += 1
+            if frontier is None:
+                frontier_counts, frontier_occupied = counts[:-1], occupied[:-1]
+            else:
+                frontier_counts, frontier_occupied = (
+                    counts[frontier],
+                    occupied[frontier],
+                )
+            following = (frontier_counts == 0) | (frontier_occupied != 0) & (
+                frontier_counts < tolerance
+            )
+            changes = following != frontier_occupied
+            previous_flipped = flipped
+            flipped = np.flatnonzero(changes) if frontier is None else frontier[changes]
+            if not len(flipped):
+                return step, int(occupied.sum())
+            if np.array_equal(flipped, previous_flipped):
+                raise ValueError("The seats alternate between two layouts forever.")
+            occupied[flipped] ^= 1
+            if len(flipped) * len(index) > seat_count // DENSE_FRONTIER_FRACTION:
+                # recounting everything beats sorting large frontiers
+                counts.fill(0)
+                for neighbors in index:
+                    counts[:-1] += occupied[neighbors]
+                frontier = None
+            else:
+                neighbors = index[:, flipped].ravel()
+                deltas = 2 * occupied[flipped].astype(np.int16) - 1
+                np.add.at(counts, neighbors, np.tile(deltas, len(index)))
+                frontier = np.unique(np.concatenate((flipped, neighbors)))
+                if frontier[-1] == seat_count:
+                    frontier = frontier[:-1]
+
+    def settle_parallel(
+        self, index: np.ndarray, tolerance: int, worker_count: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Step until nothing changes, with bands of seats in worker processes.
+
+        index is adjacent_index or line_of_sight_index; all arrays are shared.
+        Returns the number of steps and the final number of occupied seats.
+        """
+        worker_count = worker_count or os.cpu_count() or 1
+        seat_count = index.shape[1]
+        memories = [
+            SharedMemory(create=True, size=max(1, size))
+            for size in [index.nbytes, 2 * (seat_count + 1), 32 * (worker_count + 1)]
+        ]
+        try:
+            shared_index = np.ndarray(
+                index.shape, dtype=index.dtype, buffer=memories[0].buf
+            )
+            shared_index[...] = index
+            buffers = np.ndarray(
+                (2, seat_count + 1), dtype=np.uint8, buffer=memories[1].buf
+            )
+            buffers.fill(0)
+            buffers[0, :-1] = self.occupied[self.seats]
+            statistics = np.ndarray(
+                (2, worker_count + 1, 2), dtype=np.int64, buffer=memories[2].buf
+            )
+            statistics.fill(0)
+
+            barrier = multiprocessing.Barrier(worker_count)
+            bounds = np.linspace(0, seat_count, worker_count + 1).astype(int)
+            workers = [
+                multiprocessing.Process(
+                    target=settle_band,
+                    args=(
+                        Band(
+                            memories[0].name,
+                            index.dtype.str,
+                            memories[1].name,
+                            memories[2].name,
+                            seat_count,
+                            worker_count,
+                            worker,
+                            bounds[worker],
+                            bounds[worker + 1],
+                            tolerance,
+                        ),
+                        barrier,
+                    ),
+                )
+                for worker in range(worker_count)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            if any(worker.exitcode for worker in workers):
+                raise RuntimeError("A seating worker failed.")
+            step, alternating = statistics[0, worker_count]
+            if alternating:
+                raise ValueError("The seats alternate between two layouts forever.")
+            return int(step), int(buffers[step % 2].sum())
+        finally:
+            shared_index = buffers = statistics = None
+            for memory in memories:
+                memory.close()
+                memory.unlink()
+
+
 def main() -> None:
-    first_board = Board(aoc.get_str(11).strip())
-
-    board = first_board
-    for step in itertools.count(1):
-        last_board = board
-        board = last_board.next()
-        if last_board == board:
-            break
-    print(
-        f"After step {step} {board.occupied_count} seats were occupied. "
-        "The previous state was identical."
-    )
-
-    board = first_board
-    for step in itertools.count(1):
-        last_board = board
-        board = last_board.next2()
-        if last_board == board:
-            break
-    print(
-        f"After step {step} {board.occupied_count} seats were occupied. "
-        "The previous state was identical."
-    )
+    with aoc.stage("parse"):
+        grid = SeatGrid(aoc.get_str(11).strip())
+
+    with aoc.stage("part1"):
+        if MODE == "frontier":
+            step, occupied_count = grid.settle_frontier(grid.adjacent_index(), 4)
+        elif MODE == "parallel":
+            step, occupied_count = grid.settle_parallel(grid.adjacent_index(), 4)
+        else:
+            step, occupied_count = grid.settle_adjacent()
+        print(
+            f"After step {step} {occupied_count} seats were occupied. "
+            "The previous state was identical."
+        )
+
+    with aoc.stage("part2"):
+        if MODE == "frontier":
+            step, occupied_count = grid.settle_frontier(grid.line_of_sight_index(), 5)
+        elif MODE == "parallel":
+            step, occupied_count = grid.settle_parallel(grid.line_of_sight_index(), 5)
+        else:
+            step, occupied_count = grid.settle_visible()
+        print(
+            f"After step {step} {occupied_count} seats were occupied. "
+            "The previous state was identical."
+        )
 
 
 if __name__ == "__main__":
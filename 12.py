@@ -1,9 +1,240 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
 from math import cos, radians, sin
-from typing import List
+from pathlib import Path
+from typing import List, Sequence, Tuple
 
 import aoc
+import numpy as np
+
+# Gaussian integers x + yi as (x, y), for positions, headings and waypoints.
+Vector = Tuple[int, int]
+
+ACTIONS = "NSEWLRF"
+UNITS = {"N": (0, 1), "S": (0, -1), "E": (1, 0), "W": (-1, 0)}
+QUARTER_TURNS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+# Command streams are reduced in chunks of this many commands.
+CHUNK_SIZE = 1 << 16
+
+
+def multiply(a: Vector, b: Vector) -> Vector:
+    return a[0] * b[0] - a[1] * b[1], a[0] * b[1] + a[1] * b[0]
+
+
+def add(a: Vector, b: Vector) -> Vector:
+    return a[0] + b[0], a[1] + b[1]
+
+
+@dataclass(frozen=True)
+class Transform:
+    """An integer affine map of the ship state (position, direction).
+
+    The direction is the heading or the waypoint. The map is
+    direction -> rotation * direction + offset and
+    position -> position + factor * direction + shift.
+    Transforms compose associatively, so command streams can be reduced in
+    any grouping.
+    """
+
+    rotation: Vector = (1, 0)
+    offset: Vector = (0, 0)
+    factor: Vector = (0, 0)
+    shift: Vector = (0, 0)
+
+    @classmethod
+    def from_command(cls, command: str, waypoint: bool) -> Transform:
+        """With waypoint, N, S, E and W move the waypoint, else the ship."""
+        action, value = command[0], int(command[1:])
+        if action in UNITS:
+            movement = value * UNITS[action][0], value * UNITS[action][1]
+            return cls(offset=movement) if waypoint else cls(shift=movement)
+        if action == "F":
+            return cls(factor=(value, 0))
+        if action in "LR" and value % 90 == 0:
+            turns = value // 90 if action == "L" else -value // 90
+            return cls(rotation=QUARTER_TURNS[turns % 4])
+        raise ValueError(f"Command '{command}' not known")
+
+    def then(self, other: Transform) -> Transform:
+        """This transform followed by other."""
+        return Transform(
+            multiply(other.rotation, self.rotation),
+            add(multiply(other.rotation, self.offset), other.offset),
+            add(self.factor, multiply(other.factor, self.rotation)),
+            add(add(self.shift, multiply(other.factor, self.offset)), other.shift),
+        )
+
+    def apply(self, position: Vector, direction: Vector) -> Tuple[Vector, Vector]:
+        return (
+            add(add(position, multiply(self.factor, direction)), self.shift),
+            add(multiply(self.rotation, direction), self.offset),
+        )
+
+
+IDENTITY = Transform()
+
+
+def compose(commands: Sequence[str], waypoint: bool) -> Transform:
+    """Transform.from_command of all commands composed with Transform.then.
+
+    The composition is specialized per action, as every command only touches
+    some of the components.
+    """
+    rx, ry = IDENTITY.rotation
+    ox = oy = fx = fy = sx = sy = 0
+    for command in commands:
+        action, value = command[0], int(command[1:])
+        if action == "F":
+            fx, fy = fx + value * rx, fy + value * ry
+            sx, sy = sx + value * ox, sy + value * oy
+        elif action in UNITS:
+            dx, dy = UNITS[action]
+            if waypoint:
+                ox, oy = ox + value * dx, oy + value * dy
+            else:
+                sx, sy = sx + value * dx, sy + value * dy
+        else:
+            turn = Transform.from_command(command, waypoint).rotation
+            rx, ry = multiply(turn, (rx, ry))
+            ox, oy = multiply(turn, (ox, oy))
+    return Transform((rx, ry), (ox, oy), (fx, fy), (sx, sy))
+
+
+def compose_chunks(
+    commands: Sequence[str], waypoint: bool, worker_count: int = 1
+) -> List[Transform]:
+    """The transform of every chunk of CHUNK_SIZE commands."""
+    chunks = [
+        commands[start : start + CHUNK_SIZE]
+        for start in range(0, len(commands), CHUNK_SIZE)
+    ]
+    if worker_count <= 1 or len(chunks) <= 1:
+        return [compose(chunk, waypoint) for chunk in chunks]
+    with ProcessPoolExecutor(worker_count) as executor:
+        return list(executor.map(partial(compose, waypoint=waypoint), chunks))
+
+
+class Route:
+    """A command stream with the transforms of all chunk prefixes.
+
+    The state after any number of commands is found in O(CHUNK_SIZE).
+    """
+
+    commands: Sequence[str]
+    waypoint: bool
+    # prefixes[k] is the transform of the first k chunks
+    prefixes: List[Transform]
+
+    def __init__(self, commands: Sequence[str], waypoint: bool, worker_count: int = 1):
+        self.commands = commands
+        self.waypoint = waypoint
+        self.prefixes = [IDENTITY]
+        for transform in compose_chunks(commands, waypoint, worker_count):
+            self.prefixes.append(self.prefixes[-1].then(transform))
+
+    def transform_after(self, count: int) -> Transform:
+        """The transform of the first count commands."""
+        chunk, remainder = divmod(count, CHUNK_SIZE)
+        start = chunk * CHUNK_SIZE
+        return self.prefixes[chunk].then(
+            compose(self.commands[start : start + remainder], self.waypoint)
+        )
+
+    def state_after(
+        self, count: int, position: Vector, direction: Vector
+    ) -> Tuple[Vector, Vector]:
+        return self.transform_after(count).apply(position, direction)
+
+
+def pad_logs(logs: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Actions (as indices into ACTIONS) and values of many command logs.
+
+    The arrays are (log count, longest log length); shorter logs are padded
+    with F0, which does not change any ship.
+    """
+    lengths = np.array([len(log) for log in logs], dtype=np.int64)
+    length = int(lengths.max(initial=0))
+    actions = np.full((len(logs), length), ACTIONS.index("F"), dtype=np.int8)
+    values = np.zeros((len(logs), length), dtype=np.int64)
+    # parse all commands at once from their concatenation
+    data = np.frombuffer(
+        "".join(command + "\n" for log in logs for command in log).encode(),
+        dtype=np.uint8,
+    )
+    ends = np.flatnonzero(data == ord("\n"))
+    starts = np.concatenate(([0], ends + 1))[:-1].astype(np.int64)
+    action_codes = np.full(256, -1, dtype=np.int8)
+    action_codes[[ord(action) for action in ACTIONS]] = np.arange(len(ACTIONS))
+    command_actions = action_codes[data[starts]]
+    if np.any(command_actions < 0):
+        raise ValueError("Unknown navigation action.")
+    command_values = np.zeros(len(starts), dtype=np.int64)
+    for offset in range(1, int((ends - starts).max(initial=1))):
+        inside = offset < ends - starts
+        digits = data[np.minimum(starts + offset, len(data) - 1)] - ord("0")
+        command_values[inside] = command_values[inside] * 10 + digits[inside]
+    rows = np.repeat(np.arange(len(logs)), lengths)
+    columns = np.arange(len(starts)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    actions[rows, columns] = command_actions
+    values[rows, columns] = command_values
+    return actions, values
+
+
+def simulate_batch(
+    actions: np.ndarray, values: np.ndarray, waypoint: bool, direction: Vector
+) -> np.ndarray:
+    """The final (x, y) of every ship, all stepped together per command index.
+
+    With waypoint, N, S, E and W move the waypoint, else the ship.
+    """
+    turning = (actions == ACTIONS.index("L")) | (actions == ACTIONS.index("R"))
+    if np.any(values[turning] % 90):
+        raise ValueError("Ships can only turn by multiples of 90 degrees.")
+    # per action: the movement unit, the quarter turns per 90° and moving forward
+    units = np.array([UNITS.get(action, (0, 0)) for action in ACTIONS])
+    turn_signs = np.array([{"L": 1, "R": -1}.get(action, 0) for action in ACTIONS])
+    forward = np.array([action == "F" for action in ACTIONS])
+    turn_cosines = np.array([rotation[0] for rotation in QUARTER_TURNS])
+    turn_sines = np.array([rotation[1] for rotation in QUARTER_TURNS])
+
+    positions = np.zeros((len(actions), 2), dtype=np.int64)
+    directions = np.tile(np.array(direction, dtype=np.int64), (len(actions), 1))
+    moved = directions if waypoint else positions
+    for action, value in zip(actions.T, values.T):
+        moved += units[action] * value[:, None]
+        positions += directions * (forward[action] * value)[:, None]
+        turns = turn_signs[action] * value // 90 % 4
+        cosines, sines = turn_cosines[turns], turn_sines[turns]
+        directions[:] = np.stack(
+            (
+                directions[:, 0] * cosines - directions[:, 1] * sines,
+                directions[:, 0] * sines + directions[:, 1] * cosines,
+            ),
+            axis=1,
+        )
+    return positions
+
+
+def run_batch(paths: Sequence[Path]) -> List[Tuple[int, int]]:
+    """The distances of both parts for every command file, simulated at once."""
+    with aoc.stage("parse"):
+        actions, values = pad_logs([path.read_text().split() for path in paths])
+    distances = []
+    for stage, waypoint, direction in [
+        ("part1", False, (1, 0)),
+        ("part2", True, (10, 1)),
+    ]:
+        with aoc.stage(stage):
+            positions = simulate_batch(actions, values, waypoint, direction)
+            distances.append(np.abs(positions).sum(axis=1).tolist())
+    return list(zip(*distances))
 
 
 class Ship:
@@ -92,13 +323,25 @@ class Ship:
 
 
 def main() -> None:
-    ship = Ship(aoc.get_lines(12))
-    ship.run()
-    print(ship.manhattan_distance)
+    if sys.argv[1:2] == ["--batch"]:
+        # 12.py --batch FILE... prints both distances of every command file
+        paths = [Path(argument) for argument in sys.argv[2:]]
+        for path, (part1, part2) in zip(paths, run_batch(paths)):
+            print(f"{path}: {part1} {part2}")
+        return
+
+    with aoc.stage("parse"):
+        commands = aoc.get_lines(12)
+
+    with aoc.stage("part1"):
+        route = Route(commands, waypoint=False, worker_count=os.cpu_count() or 1)
+        (x, y), _ = route.state_after(len(commands), (0, 0), (1, 0))
+        print(abs(x) + abs(y))
 
-    ship = Ship(aoc.get_lines(12))
-    ship.run2()
-    print(ship.manhattan_distance)
+    with aoc.stage("part2"):
+        route = Route(commands, waypoint=True, worker_count=os.cpu_count() or 1)
+        (x, y), _ = route.state_after(len(commands), (0, 0), (10, 1))
+        print(abs(x) + abs(y))
 
 
 if __name__ == "__main__":
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import aoc
 import more_itertools
@@ -112,38 +112,49 @@ class Matrix:
                 break
 
 
-def main() -> None:
-    blocks = aoc.get_str(16).strip().split("\n\n")
+def parse_input(day: int) -> Tuple[List[Field], List[Ticket], int]:
+    blocks = (str(record, "utf-8") for record in aoc.get_record_views(day))
 
     fields: List[Field] = []
     tickets: List[Ticket] = []
 
-    for line in blocks[0].split("\n"):
+    for line in next(blocks).split("\n"):
         field = Field(
             **parse.parse("{title}: {from1:d}-{to1:d} or {from2:d}-{to2:d}", line).named
         )
         fields.append(field)
 
     ticket_error_count = 0
-    for line in [*blocks[1].split("\n")[1:], *blocks[2].split("\n")[1:]]:
-        ticket = Ticket([int(word) for word in line.split(",")])
-        if not (errors := ticket.values_not_matching_any(fields)):
-            tickets.append(ticket)
-        else:
-            ticket_error_count += sum(errors)
+    for block in blocks:
+        # the first line of the ticket blocks is their heading
+        lines = iter(block.split("\n"))
+        next(lines)
+        for line in lines:
+            ticket = Ticket([int(word) for word in line.split(",")])
+            if not (errors := ticket.values_not_matching_any(fields)):
+                tickets.append(ticket)
+            else:
+                ticket_error_count += sum(errors)
+    return fields, tickets, ticket_error_count
+
+
+def main() -> None:
+    with aoc.stage("parse"):
+        fields, tickets, ticket_error_count = aoc.cached_parse(16, parse_input)
     print(ticket_error_count)
 
-    matrix = Matrix(tickets, fields)
-    matrix.solve(verbose=True)
+    with aoc.stage("part2"):
+        matrix = Matrix(tickets, fields)
+        matrix.solve(verbose=True)
 
-    factor = 1
+        factor = 1
 
-    my_ticket = tickets[0]
-    for field in fields:
-        if "departure" in field.title and field.index is not None:
-            factor *= my_ticket.values[field.index]
-    print()
-    print(f"Determined factor {factor}!")
+        my_ticket = tickets[0]
+        for field in fields:
+            if "departure" in field.title and field.index is not None:
+                factor *= my_ticket.values[field.index]
+        print()
+        print(f"Determined factor {factor}!")
 
 
 if __name__ == "__main__":
@@ -207,16 +207,19 @@ class World4D(World3D):
 
 
 def main() -> None:
-    string = aoc.get_str(17).strip()
-    world = World3D(string)
-    for cycle in range(1, 7):
-        world = world.next()
-    print(world.count)
-
-    world = World4D(string)
-    for cycle in range(1, 7):
-        world = world.next()
-    print(world.count)
+    with aoc.stage("parse"):
+        string = aoc.get_str(17).strip()
+    with aoc.stage("part1"):
+        world = World3D(string)
+        for cycle in range(1, 7):
+            world = world.next()
+        print(world.count)
+
+    with aoc.stage("part2"):
+        world = World4D(string)
+        for cycle in range(1, 7):
+            world = world.next()
+        print(world.count)
 
 
 if __name__ == "__main__":
@@ -107,8 +107,12 @@ def interprete2(lexemes: Iterable[Union[Operation, Delimiter, int]]) -> int:
 
 
 def main() -> None:
-    print(sum(interprete(lex(tokenize(line))) for line in aoc.get_lines(18)))
-    print(sum(interprete2(lex(tokenize(line))) for line in aoc.get_lines(18)))
+    with aoc.stage("parse"):
+        lines = aoc.get_lines(18)
+    with aoc.stage("part1"):
+        print(sum(interprete(lex(tokenize(line))) for line in lines))
+    with aoc.stage("part2"):
+        print(sum(interprete2(lex(tokenize(line))) for line in lines))
 
 
 if __name__ == "__main__":
@@ -28,49 +28,51 @@ def transpile(rule: str) -> str:
 
 
 def main() -> None:
-    content = aoc.get_str(19).strip()
+    with aoc.stage("parse"):
+        rule_strings, lines = (
+            str(record, "utf-8") for record in aoc.get_record_views(19)
+        )
+    with aoc.stage("part1"):
+        rules: Dict[int, str] = {
+            int(rule_string.split(": ", 1)[0]): transpile(rule_string.split(": ", 1)[1])
+            for rule_string in rule_strings.split("\n")
+        }
+        is_fulfilled = False
+        while not is_fulfilled:
+            is_fulfilled = True
+            for rule_key, rule in rules.items():
+                for key, replacement_rule in rules.items():
+                    rule = rule.replace(rule_key_for_rule_index(key), replacement_rule)
+                rules[rule_key] = rule
+                is_fulfilled = is_fulfilled and "<<" not in rule
 
-    rule_strings, lines = content.split("\n\n")
-    rules: Dict[int, str] = {
-        int(rule_string.split(": ", 1)[0]): transpile(rule_string.split(": ", 1)[1])
-        for rule_string in rule_strings.split("\n")
-    }
-    is_fulfilled = False
-    while not is_fulfilled:
-        is_fulfilled = True
-        for rule_key, rule in rules.items():
-            for key, replacement_rule in rules.items():
-                rule = rule.replace(rule_key_for_rule_index(key), replacement_rule)
-            rules[rule_key] = rule
-            is_fulfilled = is_fulfilled and "<<" not in rule
-
-    pattern = re.compile(f"^{rules[0]}$", re.MULTILINE)
-    match_count = len(pattern.findall(lines))
-    print(match_count)
+        pattern = re.compile(f"^{rules[0]}$", re.MULTILINE)
+        match_count = len(pattern.findall(lines))
+        print(match_count)
 
     ###########################
 
-    rule_strings, lines = content.split("\n\n")
-    rules: Dict[int, str] = {
-        int(rule_string.split(": ", 1)[0]): transpile(rule_string.split(": ", 1)[1])
-        for rule_string in rule_strings.split("\n")
-    }
-    rules[8] = transpile("42 | 42 8")
-    rules[11] = transpile("42 31 | 42 11 31")
-    is_fulfilled = False
-    max_depth = 4  # max(len(line) for line in lines.split("\n"))
-    while not is_fulfilled and max_depth > 0:
-        max_depth -= 1
-        is_fulfilled = True
-        for rule_key, rule in rules.items():
-            for key, replacement_rule in rules.items():
-                rule = rule.replace(rule_key_for_rule_index(key), replacement_rule)
-            rules[rule_key] = rule
-            is_fulfilled = is_fulfilled and "<<" not in rule
+    with aoc.stage("part2"):
+        rules: Dict[int, str] = {
+            int(rule_string.split(": ", 1)[0]): transpile(rule_string.split(": ", 1)[1])
+            for rule_string in rule_strings.split("\n")
+        }
+        rules[8] = transpile("42 | 42 8")
+        rules[11] = transpile("42 31 | 42 11 31")
+        is_fulfilled = False
+        max_depth = 4  # max(len(line) for line in lines.split("\n"))
+        while not is_fulfilled and max_depth > 0:
+            max_depth -= 1
+            is_fulfilled = True
+            for rule_key, rule in rules.items():
+                for key, replacement_rule in rules.items():
+                    rule = rule.replace(rule_key_for_rule_index(key), replacement_rule)
+                rules[rule_key] = rule
+                is_fulfilled = is_fulfilled and "<<" not in rule
 
-    pattern = re.compile(f"^{rules[0]}$", re.MULTILINE)
-    match_count = len(pattern.findall(lines))
-    print(match_count)
+        pattern = re.compile(f"^{rules[0]}$", re.MULTILINE)
+        match_count = len(pattern.findall(lines))
+        print(match_count)
 
 
 if __name__ == "__main__":
@@ -9,8 +9,6 @@ from typing import Any, Optional, Union
 import aoc
 import parse
 
-TILE_SIZE = 10
-
 SNAKE_KERNEL = [
     [True if character == "#" else False for character in line]
     for line in "                  # \n#    ##    ##    ###\n #  #  #  #  #  #   ".split(
@@ -90,9 +88,9 @@ class Tile:
         elif direction == Direction.SOUTH:
             return self.array[-1]
         elif direction == Direction.EAST:
-            return [self.array[y][-1] for y in range(TILE_SIZE)]
+            return [row[-1] for row in self.array]
         else:  # if direction == Direction.WEST:
-            return [self.array[y][0] for y in range(TILE_SIZE)]
+            return [row[0] for row in self.array]
 
     def matches(self, tile: Tile, direction: Direction) -> bool:
         return self.edge(direction) == tile.edge(direction.opposite)
@@ -175,6 +173,10 @@ class Tile:
 class World(dict[Coordinate, Tile]):
     array: list[list[bool]]
 
+    @property
+    def tile_size(self) -> int:
+        return len(next(iter(self.values())).array)
+
     def coordinate(self, tile: Tile) -> Coordinate:
         return {v: k for k, v in self.items()}[tile]
 
@@ -207,8 +209,9 @@ class World(dict[Coordinate, Tile]):
         acc = ""
 
         if len(self) > 0:
+            tile_size = self.tile_size
             for y in range(min_y, max_y + 1):
-                for y2 in range(TILE_SIZE):
+                for y2 in range(tile_size):
                     for x in range(min_x, max_x + 1):
                         coord = Coordinate(x, y)
                         acc += (
@@ -216,7 +219,7 @@ class World(dict[Coordinate, Tile]):
                                 "#" if pixel else "." for pixel in self[coord].array[y2]
                             )
                             if coord in self
-                            else " " * TILE_SIZE
+                            else " " * tile_size
                         )
                         acc += " "
                     acc = acc[:-1]
@@ -252,55 +255,63 @@ class World(dict[Coordinate, Tile]):
         max_x = max(coordinate.x for coordinate in self.keys())
         max_y = max(coordinate.y for coordinate in self.keys())
 
+        inner = self.tile_size - 2
         array = [
-            [False for _ in range(((max_x - min_x + 1) * (TILE_SIZE - 2)))]
-            for _ in range((max_y - min_y + 1) * (TILE_SIZE - 2))
+            [False for _ in range((max_x - min_x + 1) * inner)]
+            for _ in range((max_y - min_y + 1) * inner)
         ]
         for y in range(min_y, max_y + 1):
             for x in range(min_x, max_x + 1):
-                for y2 in range(1, TILE_SIZE - 1):
-                    for x2 in range(1, TILE_SIZE - 1):
-                        array[(TILE_SIZE - 2) * (y - min_y) + y2 - 1][
-                            (TILE_SIZE - 2) * (x - min_x) + x2 - 1
+                for y2 in range(1, inner + 1):
+                    for x2 in range(1, inner + 1):
+                        array[inner * (y - min_y) + y2 - 1][
+                            inner * (x - min_x) + x2 - 1
                         ] = self[Coordinate(x, y)].array[y2][x2]
         tile = Tile(self, "Tile 0:\n")
         tile.array = array
         return tile
 
 
+def parse_input(day: int) -> tuple[World, list[Tile]]:
+    world = World()
+    tiles = [Tile(world, str(tile, "utf-8")) for tile in aoc.get_record_views(day)]
+    return world, tiles
+
+
 def main() -> None:
-    content = aoc.get_str(20).strip()
     # content = "Tile 2311:\n..##.#..#.\n##..#.....\n#...##..#.\n####.#...#\n##.##.###.\n##...#.###\n.#.#.#..##\n..#....#..\n###...#.#.\n..###..###\n\nTile 1951:\n#.##...##.\n#.####...#\n.....#..##\n#...######\n.##.#....#\n.###.#####\n###.##.##.\n.###....#.\n..#.#..#.#\n#...##.#..\n\nTile 1171:\n####...##.\n#..##.#..#\n##.#..#.#.\n.###.####.\n..###.####\n.##....##.\n.#...####.\n#.##.####.\n####..#...\n.....##...\n\nTile 1427:\n###.##.#..\n.#..#.##..\n.#.##.#..#\n#.#.#.##.#\n....#...##\n...##..##.\n...#.#####\n.#.####.#.\n..#..###.#\n..##.#..#.\n\nTile 1489:\n##.#.#....\n..##...#..\n.##..##...\n..#...#...\n#####...#.\n#..#.#.#.#\n...#.#.#..\n##.#...##.\n..##.##.##\n###.##.#..\n\nTile 2473:\n#....####.\n#..#.##...\n#.##..#...\n######.#.#\n.#...#.#.#\n.#########\n.###.#..#.\n########.#\n##...##.#.\n..###.#.#.\n\nTile 2971:\n..#.#....#\n#...###...\n#.#.###...\n##.##..#..\n.#####..##\n.#..####.#\n#..#.#..#.\n..####.###\n..#.#.###.\n...#.#.#.#\n\nTile 2729:\n...#.#.#.#\n####.#....\n..#.#.....\n....#..#.#\n.##..##.#.\n.#.####...\n####.#.#..\n##.####...\n##..#.##..\n#.##...##.\n\nTile 3079:\n#.#.#####.\n.#..######\n..#.......\n######....\n####.#..#.\n.#...#.##.\n#.#####.##\n..#.###...\n..#.......\n..#.###..."
 
-    world = World()
-    tiles = [Tile(world, tile) for tile in content.split("\n\n")]
-    anchor = tiles.pop(0)
-    coordinate = Coordinate(0, 0)
-    world[coordinate] = anchor
-    placed_tiles = [anchor]
-    while placed_tiles:
-        anchor = placed_tiles.pop()
-        for direction in [
-            Direction.NORTH,
-            Direction.EAST,
-            Direction.SOUTH,
-            Direction.WEST,
-        ]:
-            if (tile := anchor.find_neighbor(tiles, direction)) is not None:
-                placed_tiles.append(tile)
-    print(world.simple_grid)
-    print(world.big_grid)
-    print(world.product)
-
-    picture = world.merge()
-    print(picture.pretty())
-    print(f"{picture.count_snakes} snakes")
-    print(
-        sum(
-            sum([1 if ((pixel is not None) and pixel) else 0 for pixel in line])
-            for line in picture.array
+    with aoc.stage("parse"):
+        world, tiles = aoc.cached_parse(20, parse_input)
+    with aoc.stage("part1"):
+        anchor = tiles.pop(0)
+        coordinate = Coordinate(0, 0)
+        world[coordinate] = anchor
+        placed_tiles = [anchor]
+        while placed_tiles:
+            anchor = placed_tiles.pop()
+            for direction in [
+                Direction.NORTH,
+                Direction.EAST,
+                Direction.SOUTH,
+                Direction.WEST,
+            ]:
+                if (tile := anchor.find_neighbor(tiles, direction)) is not None:
+                    placed_tiles.append(tile)
+        print(world.simple_grid)
+        print(world.big_grid)
+        print(world.product)
+
+    with aoc.stage("part2"):
+        picture = world.merge()
+        print(picture.pretty())
+        print(f"{picture.count_snakes} snakes")
+        print(
+            sum(
+                sum([1 if ((pixel is not None) and pixel) else 0 for pixel in line])
+                for line in picture.array
+            )
         )
-    )
 
 
 if __name__ == "__main__":
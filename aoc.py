@@ -1,25 +1,120 @@
+import atexit
+import cProfile
+import fcntl
+import hashlib
+import inspect
+import json
+import mmap
+import os
+import pickle
 import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import formatdate
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
 
 COOKIE_PATH = Path(sys.argv[0]).parent / "COOKIE.txt"
-URL = "https://adventofcode.com/2020/day/{}/input"
+URL = os.environ.get("AOC_URL", "https://adventofcode.com/2020/day/{}/input")
 CACHE_FILE_NAME_TEMPLATE = "{:02d}.txt"
 CACHE_DIRECTORY = Path("input")
+CHUNK_SIZE = 1 << 16
+PREFETCH_WORKERS = 8
+PARSE_CACHE_DIRECTORY = Path(".parse_cache")
+PARSE_CACHE_MAX_BYTES = int(os.environ.get("AOC_PARSE_CACHE_MAX_BYTES", 256 << 20))
+INSTRUMENTATION_DIRECTORY: Optional[Path] = (
+    Path(os.environ["AOC_INSTRUMENT"]) if os.environ.get("AOC_INSTRUMENT") else None
+)
+PROFILE_STAGES = bool(os.environ.get("AOC_PROFILE"))
+
+T = TypeVar("T")
+Buffer = Union[mmap.mmap, bytes]
+
+stage_timings: Dict[str, float] = {}
+stage_reports: Dict[str, Dict[str, Any]] = {}
+stage_profiles: Dict[str, cProfile.Profile] = {}
 
 
 def cache_file_for_day(day: int) -> Path:
     return CACHE_DIRECTORY / CACHE_FILE_NAME_TEMPLATE.format(day)
 
 
-def ensure_downloaded(day: int) -> None:
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def session() -> requests.Session:
+    """Return the shared session, so all downloads reuse one connection pool."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=PREFETCH_WORKERS)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            if COOKIE_PATH.exists():
+                _session.cookies["session"] = COOKIE_PATH.read_text().strip()
+        return _session
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on path, shared between threads and processes."""
+    with path.with_suffix(".lock").open("w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def ensure_downloaded(day: int, refresh: bool = False) -> None:
+    """Download the input unless it is cached.
+
+    With refresh the server is asked again, but only sends the file if it
+    changed since it was cached. The file is replaced atomically, so readers
+    never see a partial download.
+    """
     cache_file = cache_file_for_day(day)
-    if not cache_file.exists():
-        cookies = {"session": COOKIE_PATH.read_text().strip()}
-        CACHE_DIRECTORY.mkdir(exist_ok=True)
-        cache_file.write_bytes(requests.get(URL.format(day), cookies=cookies).content)
+    if cache_file.exists() and not refresh:
+        return
+    CACHE_DIRECTORY.mkdir(exist_ok=True)
+    with file_lock(cache_file):
+        headers = {}
+        if cache_file.exists():
+            if not refresh:  # another runner downloaded it while we waited
+                return
+            modified = cache_file.stat().st_mtime
+            headers["If-Modified-Since"] = formatdate(modified, usegmt=True)
+        response = session().get(URL.format(day), headers=headers)
+        if response.status_code == requests.codes.not_modified:
+            return
+        response.raise_for_status()
+        temporary_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        temporary_file.write_bytes(response.content)
+        temporary_file.replace(cache_file)
+
+
+def prefetch(days: Iterable[int], refresh: bool = False) -> None:
+    with ThreadPoolExecutor(PREFETCH_WORKERS) as executor:
+        list(executor.map(partial(ensure_downloaded, refresh=refresh), days))
 
 
 def get(day: int) -> bytes:
@@ -38,3 +133,208 @@ def get_lines(day: int) -> List[str]:
 
 def get_integers(day: int) -> List[int]:
     return [int(line) for line in get_lines(day)]
+
+
+def map_file(path: Path) -> Buffer:
+    """Map the file read-only; empty files, which cannot be mapped, give b""."""
+    with path.open("rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def get_buffer(day: int) -> Buffer:
+    ensure_downloaded(day)
+    return map_file(cache_file_for_day(day))
+
+
+def split_buffer(buffer: Buffer, separator: bytes) -> Iterator[memoryview]:
+    """Yield zero-copy views of the separated chunks, ignoring trailing whitespace."""
+    view = memoryview(buffer)
+    end = len(buffer)
+    while end and buffer[end - 1] in b" \t\r\n":
+        end -= 1
+    start = 0
+    while start < end:
+        stop = buffer.find(separator, start, end)
+        if stop == -1:
+            stop = end
+        yield view[start:stop]
+        start = stop + len(separator)
+
+
+def get_line_views(day: int) -> Iterator[memoryview]:
+    return split_buffer(get_buffer(day), b"\n")
+
+
+def get_record_views(day: int, separator: bytes = b"\n\n") -> Iterator[memoryview]:
+    return split_buffer(get_buffer(day), separator)
+
+
+def iter_chunks(day: int) -> Iterator[str]:
+    ensure_downloaded(day)
+    with cache_file_for_day(day).open() as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+def iter_records(day: int, separator: str = "\n\n") -> Iterator[str]:
+    """Lazily yield the separated records, holding only one chunk in memory.
+
+    Like get_lines, trailing whitespace at the end of the file is dropped.
+    """
+    pending = ""
+    blank_count = 0
+    for chunk in iter_chunks(day):
+        *records, pending = (pending + chunk).split(separator)
+        for record in records:
+            if not record:
+                # Only emit blank records once a non-blank one follows them.
+                blank_count += 1
+                continue
+            yield from [""] * blank_count
+            blank_count = 0
+            yield record
+    if pending := pending.rstrip():
+        yield from [""] * blank_count
+        yield pending
+
+
+def iter_lines(day: int) -> Iterator[str]:
+    return iter_records(day, "\n")
+
+
+def iter_integers(day: int) -> Iterator[int]:
+    return (int(line) for line in iter_lines(day))
+
+
+def parse_cache_file(day: int, parser: Callable[[int], T]) -> Path:
+    """The cache entry for the input and the source of the parser's module.
+
+    The whole module is hashed, as parsers mostly delegate to its classes.
+    """
+    with cache_file_for_day(day).open("rb") as file:
+        digest = hashlib.file_digest(file, "sha256")
+    digest.update(f"{parser.__module__}.{parser.__qualname__}".encode())
+    digest.update(inspect.getsource(sys.modules[parser.__module__]).encode())
+    return PARSE_CACHE_DIRECTORY / f"{day:02d}-{digest.hexdigest()}.pickle"
+
+
+def evict_parse_cache(max_bytes: int = PARSE_CACHE_MAX_BYTES) -> None:
+    """Delete the least recently used entries until the cache fits max_bytes.
+
+    Entries another process deletes in the meantime are skipped.
+    """
+    entries = []
+    for path in PARSE_CACHE_DIRECTORY.glob("*.pickle"):
+        try:
+            entries.append((path.stat(), path))
+        except FileNotFoundError:
+            pass
+    entries.sort(key=lambda entry: entry[0].st_mtime)
+    total = sum(status.st_size for status, _ in entries)
+    for status, path in entries:
+        if total <= max_bytes:
+            break
+        total -= status.st_size
+        path.unlink(missing_ok=True)
+
+
+def cached_parse(day: int, parser: Callable[[int], T]) -> T:
+    """Return parser(day), reusing the pickled result of an earlier run.
+
+    Entries are keyed by the input file and the source of the parser's module,
+    so editing either one invalidates them.
+    """
+    ensure_downloaded(day)
+    cache_file = parse_cache_file(day, parser)
+    if cache_file.exists():
+        try:
+            result = pickle.loads(cache_file.read_bytes())
+        except (pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+        else:
+            cache_file.touch()
+            return result
+    result = parser(day)
+    PARSE_CACHE_DIRECTORY.mkdir(exist_ok=True)
+    temporary_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    temporary_file.write_bytes(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+    temporary_file.replace(cache_file)
+    evict_parse_cache()
+    return result
+
+
+def enable_instrumentation(directory: Path, profile: bool = False) -> None:
+    """Same as setting AOC_INSTRUMENT=directory (and AOC_PROFILE=1)."""
+    global INSTRUMENTATION_DIRECTORY, PROFILE_STAGES
+    INSTRUMENTATION_DIRECTORY = directory
+    PROFILE_STAGES = profile
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Add the wall time spent in the block to stage_timings[name].
+
+    With instrumentation enabled, the CPU time and the tracemalloc high-water
+    mark of the block are collected for the report, as is a cProfile of it if
+    PROFILE_STAGES is set.
+    """
+    instrumented = INSTRUMENTATION_DIRECTORY is not None
+    profile: Optional[cProfile.Profile] = None
+    if instrumented:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_start = tracemalloc.get_traced_memory()[0]
+        if PROFILE_STAGES:
+            profile = stage_profiles.setdefault(name, cProfile.Profile())
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    try:
+        yield
+    finally:
+        if profile is not None:
+            profile.disable()
+        elapsed = time.perf_counter() - start
+        stage_timings[name] = stage_timings.get(name, 0.0) + elapsed
+        if instrumented:
+            report = stage_reports.setdefault(
+                name, {"wall_time": 0.0, "cpu_time": 0.0, "peak_memory": 0}
+            )
+            report["wall_time"] += elapsed
+            report["cpu_time"] += time.process_time() - cpu_start
+            peak_memory = tracemalloc.get_traced_memory()[1] - memory_start
+            report["peak_memory"] = max(report["peak_memory"], peak_memory)
+
+
+def write_instrumentation_report(run_name: Optional[str] = None) -> Optional[Path]:
+    """Write the collected stage reports as JSON and start over.
+
+    Called at exit; run_all calls it after every day instead.
+    """
+    if INSTRUMENTATION_DIRECTORY is None or not stage_reports:
+        return None
+    run_name = run_name or Path(sys.argv[0]).stem
+    INSTRUMENTATION_DIRECTORY.mkdir(parents=True, exist_ok=True)
+    prefix = f"{run_name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    for name, profile in stage_profiles.items():
+        profile_file = INSTRUMENTATION_DIRECTORY / f"{prefix}-{name}.prof"
+        profile.dump_stats(profile_file)
+        stage_reports[name]["profile"] = str(profile_file)
+    report_file = INSTRUMENTATION_DIRECTORY / f"{prefix}.json"
+    report = {
+        "run": run_name,
+        "pid": os.getpid(),
+        "python": sys.version,
+        "stages": stage_reports,
+    }
+    report_file.write_text(json.dumps(report, indent=4) + "\n")
+    stage_reports.clear()
+    stage_profiles.clear()
+    return report_file
+
+
+atexit.register(write_instrumentation_report)
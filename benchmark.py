@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aoc
+import generate
+from run_all import day_files, load_day
+
+# Results are stored as {day: {case: {stage: seconds}}}, where the case is
+# the repetition factor of the real input or "gen<size>" for generated ones.
+Results = Dict[str, Dict[str, Dict[str, float]]]
+
+BASELINE_PATH = Path("benchmark_baseline.json")
+# Differences below this many seconds are considered noise.
+MINIMUM_DIFFERENCE = 0.005
+
+
+def repeat_records(separator: str) -> Callable[[str, int], str]:
+    def scale_input(text: str, scale: int) -> str:
+        return separator.join([text.strip()] * scale) + "\n"
+
+    return scale_input
+
+
+# Days whose input stays valid when repeated, so it can be scaled up.
+SCALERS: Dict[str, Callable[[str, int], str]] = {
+    "02": repeat_records("\n"),
+    "03": repeat_records("\n"),
+    "04": repeat_records("\n\n"),
+    "06": repeat_records("\n\n"),
+    "06_alternate": repeat_records("\n\n"),
+    "12": repeat_records("\n"),
+    "14": repeat_records("\n"),
+    "18": repeat_records("\n"),
+}
+
+
+def day_number(path: Path) -> int:
+    return int(path.stem[:2])
+
+
+def measure(path: Path, text: Optional[str], repeat: int) -> Dict[str, float]:
+    """Run the day repeat times and keep the fastest time of every stage.
+
+    Without text the day runs on its real input.
+    """
+    best: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        input_directory = aoc.CACHE_DIRECTORY
+        if text is not None:
+            input_directory = Path(directory) / "input"
+            input_directory.mkdir()
+            input_file = input_directory / aoc.CACHE_FILE_NAME_TEMPLATE.format(
+                day_number(path)
+            )
+            input_file.write_text(text)
+        original_directories = aoc.CACHE_DIRECTORY, aoc.PARSE_CACHE_DIRECTORY
+        try:
+            aoc.CACHE_DIRECTORY = input_directory
+            for iteration in range(repeat):
+                # a fresh parse cache for every run, so parsing is always timed
+                aoc.PARSE_CACHE_DIRECTORY = Path(directory) / f"parsed{iteration}"
+                aoc.stage_timings.clear()
+                with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                    load_day(path).main()
+                for stage, elapsed in aoc.stage_timings.items():
+                    best[stage] = min(elapsed, best.get(stage, elapsed))
+        finally:
+            aoc.CACHE_DIRECTORY, aoc.PARSE_CACHE_DIRECTORY = original_directories
+    return best
+
+
+def cases(
+    path: Path, scales: List[int], generated_sizes: List[int]
+) -> List[Tuple[str, Callable[[], Optional[str]]]]:
+    """The named inputs to run the day on, created lazily."""
+    day_cases: List[Tuple[str, Callable[[], Optional[str]]]] = []
+    for scale in scales:
+        if scale == 1:
+            day_cases.append(("1", lambda: None))
+        elif path.stem in SCALERS:
+            day_cases.append(
+                (
+                    str(scale),
+                    lambda scale=scale: SCALERS[path.stem](
+                        aoc.cache_file_for_day(day_number(path)).read_text(), scale
+                    ),
+                )
+            )
+    for size in generated_sizes:
+        day_cases.append(
+            (
+                f"gen{size}",
+                lambda size=size: generate.generate(day_number(path), size).text,
+            )
+        )
+    return day_cases
+
+
+def run(
+    paths: List[Path], scales: List[int], generated_sizes: List[int], repeat: int
+) -> Results:
+    results: Results = {}
+    for path in paths:
+        for case, text in cases(path, scales, generated_sizes):
+            try:
+                timings = measure(path, text(), repeat)
+            except Exception as error:
+                print(f"{path.stem:16} {case:8} FAILED: {error!r}")
+                continue
+            results.setdefault(path.stem, {})[case] = timings
+            for stage, elapsed in timings.items():
+                print(f"{path.stem:16} {case:8} {stage:8} {elapsed:10.4f}s")
+    return results
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> int:
+    """Print every stage that got slower than allowed and return their count."""
+    regression_count = 0
+    for day, day_results in results.items():
+        for case, timings in day_results.items():
+            for stage, elapsed in timings.items():
+                reference = baseline.get(day, {}).get(case, {}).get(stage)
+                if reference is None:
+                    continue
+                if (
+                    elapsed > reference * (1 + threshold)
+                    and elapsed - reference > MINIMUM_DIFFERENCE
+                ):
+                    regression_count += 1
+                    print(
+                        f"REGRESSION {day} {case} {stage}: "
+                        f"{reference:.4f}s -> {elapsed:.4f}s "
+                        f"(+{100 * (elapsed / reference - 1):.0f}%)"
+                    )
+    return regression_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time the parse, part1 and part2 stage of every day."
+    )
+    parser.add_argument("days", nargs="*", help="file stems, e.g. 11 07_alternate")
+    parser.add_argument("--scales", default="1,10", help="comma separated factors")
+    parser.add_argument(
+        "--generated", default="", help="comma separated sizes of generated inputs"
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--save", action="store_true", help="store as new baseline")
+    arguments = parser.parse_args()
+
+    scales = [int(scale) for scale in arguments.scales.split(",") if scale]
+    sizes = [int(size) for size in arguments.generated.split(",") if size]
+    results = run(day_files(arguments.days), scales, sizes, arguments.repeat)
+
+    if arguments.baseline.exists():
+        baseline: Results = json.loads(arguments.baseline.read_text())
+        regression_count = compare(results, baseline, arguments.threshold)
+    else:
+        baseline = {}
+        regression_count = 0
+    if arguments.save:
+        for day, day_results in results.items():
+            baseline.setdefault(day, {}).update(day_results)
+        arguments.baseline.write_text(json.dumps(baseline, indent=4) + "\n")
+    if regression_count:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,881 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import sys
+from dataclasses import dataclass, field
+from functools import reduce
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+CONSONANTS = "bcdfghjklmnprstvwz"
+VOWELS = "aeiou"
+
+SNAKE = ["                  # ", "#    ##    ##    ###", " #  #  #  #  #  #   "]
+
+
+@dataclass
+class Generated:
+    text: str
+    # Known answers, only for days where they are cheap to get exactly.
+    answers: Dict[str, Any] = field(default_factory=dict)
+
+
+def word(rng: random.Random, syllables: int = 3) -> str:
+    return "".join(
+        rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(syllables)
+    )
+
+
+def unique_words(rng: random.Random, count: int) -> List[str]:
+    words: Dict[str, None] = {}
+    syllables = 2
+    while len(words) < count:
+        words[word(rng, syllables)] = None
+        syllables = 2 + len(words).bit_length() // 4
+    return list(words)
+
+
+def generate_01(rng: random.Random, size: int, target: int = 2020) -> Generated:
+    """size expenses, exactly one pair and one triple of which sum to target."""
+    while True:
+        low = rng.randrange(1, target)
+        first = rng.randrange(1, target - 1)
+        second = rng.randrange(1, target - first)
+        planted = [low, target - low, first, second, target - first - second]
+        pairs = [
+            (a, b)
+            for i, a in enumerate(planted)
+            for b in planted[i + 1 :]
+            if a + b == target
+        ]
+        triples = [
+            (a, b, c)
+            for i, a in enumerate(planted)
+            for j, b in enumerate(planted[i + 1 :], i + 1)
+            for c in planted[j + 1 :]
+            if a + b + c == target
+        ]
+        if len(pairs) == 1 and len(triples) == 1:
+            break
+    # Filler is larger than target, so it can never be part of a solution.
+    numbers = planted + [
+        rng.randrange(target + 1, 100 * target) for _ in range(size - len(planted))
+    ]
+    rng.shuffle(numbers)
+    return Generated(
+        "".join(f"{number}\n" for number in numbers),
+        {"part1": low * (target - low), "part2": first * second * planted[-1]},
+    )
+
+
+def generate_02(rng: random.Random, size: int) -> Generated:
+    """size password policy lines."""
+    lines = []
+    part1 = part2 = 0
+    for _ in range(size):
+        character = rng.choice(string.ascii_lowercase)
+        low = rng.randint(1, 10)
+        high = rng.randint(low, 18)
+        alphabet = character * 4 + rng.choice(string.ascii_lowercase)
+        password = "".join(rng.choice(alphabet) for _ in range(rng.randint(3, 20)))
+        part1 += low <= password.count(character) <= high
+        part2 += len(password) >= high and (
+            (password[low - 1] == character) ^ (password[high - 1] == character)
+        )
+        lines.append(f"{low}-{high} {character}: {password}\n")
+    return Generated("".join(lines), {"part1": part1, "part2": part2})
+
+
+def generate_03(rng: random.Random, size: int, width: int = 31) -> Generated:
+    """A toboggan map of size rows."""
+    board = [
+        "".join("#" if rng.random() < 0.2 else "." for _ in range(width))
+        for _ in range(size)
+    ]
+
+    def count_trees(dx: int, dy: int) -> int:
+        return sum(board[y][(y // dy * dx) % width] == "#" for y in range(dy, size, dy))
+
+    slopes = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]
+    return Generated(
+        "".join(f"{line}\n" for line in board),
+        {
+            "part1": count_trees(3, 1),
+            "part2": reduce(lambda a, b: a * b, (count_trees(*s) for s in slopes)),
+        },
+    )
+
+
+PASSPORT_FIELDS: Dict[str, Tuple[Callable[[random.Random], str], ...]] = {
+    # field: (valid value, invalid value)
+    "byr": (
+        lambda rng: str(rng.randint(1920, 2002)),
+        lambda rng: str(rng.choice([rng.randint(1850, 1919), rng.randint(2003, 2030)])),
+    ),
+    "iyr": (
+        lambda rng: str(rng.randint(2010, 2020)),
+        lambda rng: str(rng.randint(1990, 2009)),
+    ),
+    "eyr": (
+        lambda rng: str(rng.randint(2020, 2030)),
+        lambda rng: str(rng.randint(2031, 2050)),
+    ),
+    "hgt": (
+        lambda rng: rng.choice(
+            [f"{rng.randint(150, 193)}cm", f"{rng.randint(59, 76)}in"]
+        ),
+        lambda rng: rng.choice(
+            [f"{rng.randint(194, 250)}cm", f"{rng.randint(20, 58)}in", "170"]
+        ),
+    ),
+    "hcl": (
+        lambda rng: "#" + "".join(rng.choice("0123456789abcdef") for _ in range(6)),
+        lambda rng: "".join(rng.choice("0123456789abcdefz") for _ in range(6)),
+    ),
+    "ecl": (
+        lambda rng: rng.choice(["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]),
+        lambda rng: rng.choice(["xry", "zzz", "red", "gmt"]),
+    ),
+    "pid": (
+        lambda rng: "".join(rng.choice(string.digits) for _ in range(9)),
+        lambda rng: "".join(rng.choice(string.digits) for _ in range(8)),
+    ),
+}
+
+
+def generate_04(rng: random.Random, size: int) -> Generated:
+    """size passports; valid, missing a field or with one invalid value."""
+    passports = []
+    part1 = part2 = 0
+    for _ in range(size):
+        fields = {name: valid(rng) for name, (valid, _) in PASSPORT_FIELDS.items()}
+        kind = rng.random()
+        if kind < 0.25:
+            del fields[rng.choice(list(fields))]
+        else:
+            part1 += 1
+            if kind < 0.5:
+                name = rng.choice(list(fields))
+                fields[name] = PASSPORT_FIELDS[name][1](rng)
+            else:
+                part2 += 1
+        if rng.random() < 0.5:
+            fields["cid"] = str(rng.randint(100, 350))
+        items = [f"{name}:{value}" for name, value in fields.items()]
+        rng.shuffle(items)
+        passports.append(
+            "".join(item + rng.choice(" \n") for item in items[:-1]) + items[-1]
+        )
+    return Generated("\n\n".join(passports) + "\n", {"part1": part1, "part2": part2})
+
+
+def generate_05(
+    rng: random.Random,
+    size: int,
+    row_bits: Optional[int] = None,
+    column_bits: int = 3,
+) -> Generated:
+    """size boarding passes of consecutive seats, one of them missing.
+
+    By default the plane has the 7 row bits of the puzzle, or as many more as
+    size seats need.
+    """
+    if row_bits is None:
+        row_bits = max(7, (size + 2).bit_length() - column_bits)
+    seat_count = 1 << (row_bits + column_bits)
+    if size + 2 > seat_count:
+        raise ValueError(f"A plane with {seat_count} seats is too small.")
+    start = rng.randrange(1, seat_count - size)
+    missing = start + (size + 1) // 2
+    seat_ids = [
+        seat_id for seat_id in range(start, start + size + 1) if seat_id != missing
+    ]
+    rng.shuffle(seat_ids)
+    letters = str.maketrans("01", "FB"), str.maketrans("01", "LR")
+    lines = []
+    for seat_id in seat_ids:
+        row, column = divmod(seat_id, 1 << column_bits)
+        lines.append(
+            f"{row:0{row_bits}b}".translate(letters[0])
+            + f"{column:0{column_bits}b}".translate(letters[1])
+            + "\n"
+        )
+    return Generated("".join(lines), {"part1": start + size, "part2": missing})
+
+
+def generate_06(rng: random.Random, size: int) -> Generated:
+    """size groups of customs declarations."""
+    groups = []
+    part1 = part2 = 0
+    for _ in range(size):
+        people = [
+            "".join(rng.sample(string.ascii_lowercase, rng.randint(1, 26)))
+            for _ in range(rng.randint(1, 5))
+        ]
+        part1 += len(set.union(*map(set, people)))
+        part2 += len(set.intersection(*map(set, people)))
+        groups.append("\n".join(people))
+    return Generated("\n\n".join(groups) + "\n", {"part1": part1, "part2": part2})
+
+
+def generate_07(rng: random.Random, size: int, window: int = 8) -> Generated:
+    """size bag rules; a small window makes for deep containment chains."""
+    colors = [f"{adjective} {word(rng, 2)}" for adjective in unique_words(rng, size)]
+    gold = rng.randrange(size // 2 + 1)
+    colors[gold] = "shiny gold"
+    # Bags only contain bags with a larger index, so the graph is acyclic.
+    children = [
+        {
+            child: rng.randint(1, 5)
+            for child in rng.sample(
+                range(index + 1, min(size, index + 1 + window)),
+                min(rng.randint(0, 3), size - index - 1),
+            )
+        }
+        for index in range(size)
+    ]
+    contains_gold = [False] * size
+    contained_bags = [0] * size
+    for index in reversed(range(size)):
+        contains_gold[index] = any(
+            child == gold or contains_gold[child] for child in children[index]
+        )
+        contained_bags[index] = sum(
+            count * (contained_bags[child] + 1)
+            for child, count in children[index].items()
+        )
+    lines = []
+    for color, contents in zip(colors, children):
+        description = ", ".join(
+            f"{count} {colors[child]} bag{'s' if count > 1 else ''}"
+            for child, count in contents.items()
+        )
+        lines.append(f"{color} bags contain {description or 'no other bags'}.\n")
+    rng.shuffle(lines)
+    return Generated(
+        "".join(lines),
+        {"part1": sum(contains_gold), "part2": contained_bags[gold]},
+    )
+
+
+def generate_08(rng: random.Random, size: int) -> Generated:
+    """A size instruction program with a single corrupted jmp.
+
+    Instructions that are jumped over are traps ("jmp +0"), and every nop is
+    "nop +0", so toggling anything but the corrupted jmp still loops.
+    """
+    program: List[str] = []
+    path: List[int] = []
+    corrupted_from = rng.randrange(size // 4, size // 2)
+    accumulator = 0
+    part1: Optional[int] = None
+    while len(program) < size:
+        path.append(len(program))
+        if part1 is None and len(program) >= corrupted_from and len(path) > 1:
+            # jumps back onto the path; as a nop it would have continued
+            part1 = accumulator
+            program.append(f"jmp {rng.choice(path[:-1]) - len(program):+d}")
+            continue
+        kind = rng.random()
+        if kind < 0.5:
+            value = rng.randint(-99, 99)
+            accumulator += value
+            program.append(f"acc {value:+d}")
+        elif kind < 0.7 or len(program) + 2 > size:
+            program.append("nop +0")
+        else:
+            skip = rng.randint(2, min(4, size - len(program)))
+            program.append(f"jmp {skip:+d}")
+            program.extend(["jmp +0"] * (skip - 1))
+    return Generated(
+        "".join(f"{instruction}\n" for instruction in program),
+        {"part1": part1, "part2": accumulator},
+    )
+
+
+def generate_09(rng: random.Random, size: int, preamble: int = 25) -> Generated:
+    """size XMAS numbers with one planted invalid number, the sum of a range."""
+    limit = 10**6
+    numbers = [rng.randint(-limit, limit) for _ in range(preamble)]
+    invalid_index = rng.randrange(preamble + (size - preamble) // 4, size)
+
+    def valid_number() -> int:
+        # The sum of two window numbers that is closest to a random target,
+        # so the numbers stay bounded instead of growing exponentially.
+        window = sorted(numbers[-preamble:])
+        target = rng.randint(-limit, limit)
+        low, high = 0, preamble - 1
+        best = window[low] + window[high]
+        while low < high:
+            total = window[low] + window[high]
+            if abs(total - target) < abs(best - target):
+                best = total
+            if total < target:
+                low += 1
+            else:
+                high -= 1
+        return best
+
+    while len(numbers) < invalid_index:
+        numbers.append(valid_number())
+    window_sums = {
+        a + b
+        for i, a in enumerate(numbers[-preamble:])
+        for b in numbers[-preamble + i + 1 :]
+    }
+    while True:
+        start = rng.randrange(invalid_index - 2)
+        end = rng.randint(start + 2, min(invalid_index, start + 50))
+        if (invalid := sum(numbers[start:end])) not in window_sums:
+            break
+    numbers.append(invalid)
+    while len(numbers) < size:
+        numbers.append(valid_number())
+
+    # The first ending range summing to the invalid number, the shortest one
+    # if several end there.
+    prefix_sums = [0]
+    for number in numbers:
+        prefix_sums.append(prefix_sums[-1] + number)
+    latest_start: Dict[int, int] = {}
+    best_range = (start, end)
+    for stop in range(2, end + 1):
+        latest_start[prefix_sums[stop - 2]] = stop - 2
+        if (begin := latest_start.get(prefix_sums[stop] - invalid)) is not None:
+            best_range = (begin, stop)
+            break
+    segment = numbers[best_range[0] : best_range[1]]
+    return Generated(
+        "".join(f"{number}\n" for number in numbers),
+        {"part1": invalid, "part2": min(segment) + max(segment)},
+    )
+
+
+def generate_10(rng: random.Random, size: int) -> Generated:
+    """size adapters with joltage gaps of 1, 2 and 3."""
+    adapters = []
+    jolts = 0
+    for _ in range(size):
+        jolts += rng.choices([1, 2, 3], [6, 1, 3])[0]
+        adapters.append(jolts)
+    chain = [0, *adapters, jolts + 3]
+    gaps = [b - a for a, b in zip(chain, chain[1:])]
+    ways = {0: 1}
+    for adapter in chain[1:]:
+        ways[adapter] = sum(ways.get(adapter - delta, 0) for delta in (1, 2, 3))
+    rng.shuffle(adapters)
+    return Generated(
+        "".join(f"{adapter}\n" for adapter in adapters),
+        {"part1": gaps.count(1) * gaps.count(3), "part2": ways[jolts + 3]},
+    )
+
+
+def seat_neighbors(floor: np.ndarray, line_of_sight: bool) -> np.ndarray:
+    """neighbors[d, s] is the seat that seat s sees in direction d.
+
+    Seats are numbered in row-major order and seeing no seat yields the seat
+    count. With line_of_sight, floor passes on what the cell behind it sees,
+    so every direction is swept from the far edge one line at a time.
+    """
+    height, width = floor.shape
+    seat_count = int(np.count_nonzero(~floor))
+    ids = np.full((height + 2, width + 2), seat_count, dtype=np.int64)
+    ids[1:-1, 1:-1][~floor] = np.arange(seat_count)
+    neighbors = np.empty((8, seat_count), dtype=np.int64)
+    directions = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+    for direction, (dx, dy) in enumerate(directions):
+        sight = np.full_like(ids, seat_count)
+        lines, line_ids, step, shift = sight, ids, dy, dx
+        if dy == 0:  # sweep columns instead of rows
+            lines, line_ids, step, shift = sight.T, ids.T, dx, dy
+        length = lines.shape[1] - 2
+        order = range(1, lines.shape[0] - 1)
+        for line in reversed(order) if step > 0 else order:
+            ahead = line_ids[line + step]
+            if line_of_sight:
+                ahead = np.where(ahead < seat_count, ahead, lines[line + step])
+            lines[line, 1:-1] = ahead[1 + shift : 1 + shift + length]
+        neighbors[direction] = sight[1:-1, 1:-1][~floor]
+    return neighbors
+
+
+def settle_seats(index: np.ndarray, tolerance: int) -> Tuple[int, np.ndarray]:
+    """Step the seats of a day 11 neighbor index until nothing changes.
+
+    Returns the occupied seat count, or -1 and the seats that keep flipping if
+    the layout alternates between two states.
+    """
+    seat_count = index.shape[1]
+    current = np.zeros(seat_count + 1, dtype=np.uint8)
+    previous = np.zeros(seat_count, dtype=np.uint8)
+    counts = np.empty(seat_count, dtype=np.uint8)
+    visible = np.empty(seat_count, dtype=np.uint8)
+    while True:
+        counts.fill(0)
+        for neighbors in index:
+            np.take(current, neighbors, out=visible)
+            counts += visible
+        following = (counts == 0) | (current[:-1] != 0) & (counts < tolerance)
+        flipping = following != current[:-1]
+        if not flipping.any():
+            return int(following.sum()), flipping
+        if np.array_equal(following, previous):
+            return -1, flipping
+        previous[...] = current[:-1]
+        current[:-1] = following
+
+
+def generate_11(rng: random.Random, size: int) -> Generated:
+    """A size × size seat layout that settles under both rules.
+
+    Random layouts tend to contain regions that flip between two states
+    forever. Those seats are turned into floor until the layout settles.
+    """
+    floor = np.array(
+        [[rng.random() < 0.25 for _ in range(size)] for _ in range(size)]
+    ).reshape(size, size)
+    while True:
+        ys, xs = np.nonzero(~floor)
+        answers = {}
+        for part, line_of_sight, tolerance in [
+            ("part1", False, 4),
+            ("part2", True, 5),
+        ]:
+            index = seat_neighbors(floor, line_of_sight)
+            occupied, flipping = settle_seats(index, tolerance)
+            if occupied < 0:
+                floor[ys[flipping], xs[flipping]] = True
+                break
+            answers[part] = occupied
+        else:
+            return Generated(
+                "".join(
+                    "".join("." if cell else "L" for cell in row) + "\n"
+                    for row in floor
+                ),
+                answers,
+            )
+
+
+def generate_12(rng: random.Random, size: int) -> Generated:
+    """size navigation instructions."""
+    commands = []
+    for _ in range(size):
+        action = rng.choice("NSEWLRFF")
+        value = rng.choice([90, 180, 270]) if action in "LR" else rng.randint(1, 100)
+        commands.append((action, value))
+    moves = {"N": (0, 1), "S": (0, -1), "E": (1, 0), "W": (-1, 0)}
+
+    def rotate(x: int, y: int, action: str, value: int) -> Tuple[int, int]:
+        for _ in range(value // 90):
+            x, y = (-y, x) if action == "L" else (y, -x)
+        return x, y
+
+    x = y = 0
+    dx, dy = 1, 0
+    for action, value in commands:
+        if action in moves:
+            x, y = x + moves[action][0] * value, y + moves[action][1] * value
+        elif action == "F":
+            x, y = x + dx * value, y + dy * value
+        else:
+            dx, dy = rotate(dx, dy, action, value)
+    part1 = abs(x) + abs(y)
+
+    x = y = 0
+    dx, dy = 10, 1
+    for action, value in commands:
+        if action in moves:
+            dx, dy = dx + moves[action][0] * value, dy + moves[action][1] * value
+        elif action == "F":
+            x, y = x + dx * value, y + dy * value
+        else:
+            dx, dy = rotate(dx, dy, action, value)
+    return Generated(
+        "".join(f"{action}{value}\n" for action, value in commands),
+        {"part1": part1, "part2": abs(x) + abs(y)},
+    )
+
+
+def primes_up_to(limit: int) -> List[int]:
+    sieve = [True] * (limit + 1)
+    sieve[0:2] = [False, False]
+    for number in range(2, int(limit**0.5) + 1):
+        if sieve[number]:
+            sieve[number * number :: number] = [False] * len(
+                sieve[number * number :: number]
+            )
+    return [number for number, is_prime in enumerate(sieve) if is_prime]
+
+
+def generate_13(rng: random.Random, size: int) -> Generated:
+    """A schedule with size slots, about a tenth of them distinct prime buses."""
+    primes = primes_up_to(max(1000, 20 * size))[3:]
+    timestamp = rng.randint(10**5, 10**7)
+    slots: List[Any] = ["x"] * size
+    offsets = [0, *rng.sample(range(1, size), min(len(primes) - 1, size // 10))]
+    for offset, bus in zip(offsets, rng.sample(primes, len(offsets))):
+        slots[offset] = bus
+    buses = {offset: bus for offset, bus in enumerate(slots) if bus != "x"}
+    first_bus = min(buses.values(), key=lambda bus: -timestamp % bus)
+    time, modulus = 0, 1
+    for offset, bus in buses.items():
+        while (time + offset) % bus:
+            time += modulus
+        modulus *= bus
+    return Generated(
+        f"{timestamp}\n{','.join(map(str, slots))}\n",
+        {"part1": first_bus * (-timestamp % first_bus), "part2": time or modulus},
+    )
+
+
+def generate_14(rng: random.Random, size: int, max_floating: int = 6) -> Generated:
+    """size memory writes under changing masks with up to max_floating Xs."""
+    lines = []
+    memory1: Dict[int, int] = {}
+    memory2: Dict[int, int] = {}
+    mask = ""
+    for index in range(size):
+        if index % 4 == 0:
+            floating = set(rng.sample(range(36), rng.randint(0, max_floating)))
+            mask = "".join(
+                "X" if bit in floating else rng.choice("01") for bit in range(36)
+            )
+            lines.append(f"mask = {mask}\n")
+        address = rng.randrange(1 << 16)
+        value = rng.randrange(1 << 36)
+        lines.append(f"mem[{address}] = {value}\n")
+        ones = int(mask.replace("X", "0"), 2)
+        memory1[address] = value & int(mask.replace("X", "1"), 2) | ones
+        addresses = [address | ones]
+        for bit, character in enumerate(reversed(mask)):
+            if character == "X":
+                addresses = [a & ~(1 << bit) for a in addresses] + [
+                    a | (1 << bit) for a in addresses
+                ]
+        for target in addresses:
+            memory2[target] = value
+    return Generated(
+        "".join(lines),
+        {"part1": sum(memory1.values()), "part2": sum(memory2.values())},
+    )
+
+
+def generate_15(rng: random.Random, size: int) -> Generated:
+    """size distinct starting numbers."""
+    starting_numbers = rng.sample(range(3 * size), size)
+    last_said = {number: turn for turn, number in enumerate(starting_numbers[:-1], 1)}
+    number = starting_numbers[-1]
+    for turn in range(size, 2020):
+        next_number = turn - last_said.get(number, turn)
+        last_said[number] = turn
+        number = next_number
+    answers = {"part1": number} if size <= 2020 else {}
+    return Generated(",".join(map(str, starting_numbers)) + "\n", answers)
+
+
+def generate_16(rng: random.Random, size: int, field_count: int = 20) -> Generated:
+    """Ticket notes with size nearby tickets, some of them invalid.
+
+    The field with rank r accepts 1 to 10(r + 1) and the column it belongs to
+    holds a value above 10r on your ticket, so field r matches exactly the
+    columns of ranks up to r and can be resolved by elimination.
+    """
+    titles = [
+        f"{'departure' if rank < 6 else 'field'} {name}"
+        for rank, name in enumerate(unique_words(rng, field_count))
+    ]
+    column_of_rank = rng.sample(range(field_count), field_count)
+    rank_of_column = [column_of_rank.index(column) for column in range(field_count)]
+    field_lines = [
+        f"{title}: 1-{5 * (rank + 1)} or {5 * (rank + 1) + 1}-{10 * (rank + 1)}\n"
+        for rank, title in enumerate(titles)
+    ]
+    rng.shuffle(field_lines)
+    your_ticket = [
+        rng.randint(10 * rank + 1, 10 * rank + 10) for rank in rank_of_column
+    ]
+
+    error_rate = 0
+    nearby_tickets = []
+    for _ in range(size):
+        ticket = [rng.randint(1, 10 * (rank + 1)) for rank in rank_of_column]
+        if rng.random() < 0.25:
+            ticket[rng.randrange(field_count)] = error = rng.randint(
+                10 * field_count + 1, 10 * field_count + 999
+            )
+            error_rate += error
+        nearby_tickets.append(",".join(map(str, ticket)) + "\n")
+    departure_product = reduce(
+        lambda a, b: a * b, (your_ticket[column_of_rank[rank]] for rank in range(6))
+    )
+    return Generated(
+        "".join(field_lines)
+        + f"\nyour ticket:\n{','.join(map(str, your_ticket))}\n"
+        + "\nnearby tickets:\n"
+        + "".join(nearby_tickets),
+        {"part1": error_rate, "part2": departure_product},
+    )
+
+
+def active_cubes(plane: np.ndarray, dimensions: int, cycles: int = 6) -> int:
+    """How many cubes are active after the cycles, from box sums of the grid."""
+    active = plane.reshape(plane.shape + (1,) * (dimensions - 2))
+    for _ in range(cycles):
+        active = np.pad(active, 1)
+        box = np.pad(active.astype(np.uint8), 1)
+        for axis in range(dimensions):
+            length = box.shape[axis] - 2
+            box = sum(
+                np.take(box, range(shift, shift + length), axis) for shift in range(3)
+            )
+        neighbors = box - active
+        active = (neighbors == 3) | active & (neighbors == 2)
+    return int(active.sum())
+
+
+def generate_17(rng: random.Random, size: int) -> Generated:
+    """A size × size initial slice."""
+    plane = np.array(
+        [[rng.random() < 0.3 for _ in range(size)] for _ in range(size)]
+    ).reshape(size, size)
+    return Generated(
+        "".join("".join("#" if cube else "." for cube in row) + "\n" for row in plane),
+        {"part1": active_cubes(plane, 3), "part2": active_cubes(plane, 4)},
+    )
+
+
+def expression(rng: random.Random, depth: int) -> Tuple[str, int, int]:
+    """Return a random expression and its value under both precedence rules."""
+    text = ""
+    value1 = 0
+    products: List[int] = [0]  # the sums between the multiplications
+    for index in range(rng.randint(2, 5)):
+        if depth > 0 and rng.random() < 0.25:
+            inner, inner1, inner2 = expression(rng, depth - 1)
+            term, term1, term2 = f"({inner})", inner1, inner2
+        else:
+            term1 = term2 = rng.randint(1, 9)
+            term = str(term1)
+        operator = rng.choice("+*") if index else "+"
+        if index:
+            text += f" {operator} "
+        text += term
+        if operator == "+":
+            value1 += term1
+            products[-1] += term2
+        else:
+            value1 *= term1
+            products.append(term2)
+    return text, value1, reduce(lambda a, b: a * b, products)
+
+
+def generate_18(rng: random.Random, size: int) -> Generated:
+    """size homework expressions."""
+    lines = []
+    part1 = part2 = 0
+    for _ in range(size):
+        text, value1, value2 = expression(rng, 3)
+        lines.append(f"{text}\n")
+        part1 += value1
+        part2 += value2
+    return Generated("".join(lines), {"part1": part1, "part2": part2})
+
+
+def generate_19(rng: random.Random, size: int) -> Generated:
+    """A rule grammar of depth growing with size, and size messages.
+
+    Rules 42 and 31 expand to blocks of 2 ** depth + 1 characters, starting
+    with "a" and "b" respectively so they never overlap. "0: 8 11" accepts
+    messages of three blocks and the looping part 2 rules accept longer ones.
+    Invalid messages have a length no rule set can produce.
+    """
+    depth = max(3, size.bit_length() // 3)
+    free_ids = (number for number in range(1000) if number not in (0, 8, 11, 31, 42))
+    rules: Dict[int, List[List[int]]] = {}
+    letters = {next(free_ids): "a", next(free_ids): "b"}
+    level = list(letters)
+    for height in range(1, depth + 1):
+        next_level = []
+        for _ in range(2 if height == depth else 3):
+            rule_id = next(free_ids)
+            rules[rule_id] = [
+                list(pair) for pair in rng.sample(list(product(level, repeat=2)), 2)
+            ]
+            next_level.append(rule_id)
+        level = next_level
+    letter_a, letter_b = letters
+    rules[42], rules[31] = [[letter_a, level[0]]], [[letter_b, level[1]]]
+    rules[8], rules[11], rules[0] = [[42]], [[42, 31]], [[8, 11]]
+
+    def expand(rule_id: int) -> str:
+        if rule_id in letters:
+            return letters[rule_id]
+        return "".join(expand(child) for child in rng.choice(rules[rule_id]))
+
+    block = (1 << depth) + 1
+    messages = []
+    part1 = part2 = 0
+    for _ in range(size):
+        kind = rng.random()
+        if kind < 0.4:
+            messages.append(expand(0))
+            part1 += 1
+            part2 += 1
+        elif kind < 0.6:
+            # at least four blocks, so part 1 does not accept it
+            leading, repeats = rng.choice([(1, 2), (2, 1), (2, 2)])
+            messages.append(
+                "".join(expand(42) for _ in range(leading))
+                + "".join(expand(42) for _ in range(repeats))
+                + "".join(expand(31) for _ in range(repeats))
+            )
+            part2 += 1
+        else:
+            length = rng.randint(2, 5) * block + rng.randint(1, block - 1)
+            messages.append("".join(rng.choice("ab") for _ in range(length)))
+    rule_lines = [
+        f"{rule_id}: " + " | ".join(" ".join(map(str, part)) for part in alternatives)
+        for rule_id, alternatives in rules.items()
+    ] + [f'{rule_id}: "{letter}"' for rule_id, letter in letters.items()]
+    rng.shuffle(rule_lines)
+    return Generated(
+        "\n".join(rule_lines) + "\n\n" + "\n".join(messages) + "\n",
+        {"part1": part1, "part2": part2},
+    )
+
+
+def generate_20(
+    rng: random.Random, size: int, tile_size: Optional[int] = None
+) -> Generated:
+    """A size × size tile jigsaw with sea monsters planted in the picture.
+
+    Every tile edge is unique, so the puzzle has exactly one solution. By
+    default tiles have the 10 pixels of the puzzle, or as many more as it takes
+    for the 2 ** (tile_size - 2) possible edges to cover the needed ones.
+    """
+    edge_count = 2 * size * (size + 1)
+    if tile_size is None:
+        tile_size = max(10, (edge_count - 1).bit_length() + 2)
+    inner = tile_size - 2
+    side = size * inner
+    image = [[rng.random() < 0.2 for _ in range(side)] for _ in range(side)]
+    snake = [
+        (x, y) for y, line in enumerate(SNAKE) for x, c in enumerate(line) if c == "#"
+    ]
+    snake_count = 0
+    for top in range(0, side - len(SNAKE) + 1, len(SNAKE) + 1):
+        for left in range(0, side - len(SNAKE[0]) + 1, len(SNAKE[0]) + 1):
+            if rng.random() < 0.1:
+                snake_count += 1
+                for x, y in snake:
+                    image[top + y][left + x] = True
+
+    used_edges = set()
+
+    def edge(start: bool, end: bool) -> List[bool]:
+        for _ in range(1000):
+            bits = [start, *(rng.random() < 0.5 for _ in range(inner)), end]
+            key = min(tuple(bits), tuple(reversed(bits)))
+            # palindromes would also match their neighbor when flipped
+            if key not in used_edges and bits != bits[::-1]:
+                used_edges.add(key)
+                return bits
+        raise ValueError(f"Not enough distinct edges for {size}² tiles.")
+
+    corners = [[rng.random() < 0.5 for _ in range(size + 1)] for _ in range(size + 1)]
+    horizontal = [
+        [edge(corners[y][x], corners[y][x + 1]) for x in range(size)]
+        for y in range(size + 1)
+    ]
+    vertical = [
+        [edge(corners[y][x], corners[y + 1][x]) for x in range(size + 1)]
+        for y in range(size)
+    ]
+
+    tile_ids = rng.sample(range(1000, 1000 + 10 * size * size), size * size)
+    tiles = []
+    for y in range(size):
+        for x in range(size):
+            array = [
+                [vertical[y][x][row]]
+                + image[y * inner + row - 1][x * inner : (x + 1) * inner]
+                + [vertical[y][x + 1][row]]
+                for row in range(1, tile_size - 1)
+            ]
+            array = [horizontal[y][x], *array, horizontal[y + 1][x]]
+            for _ in range(rng.randrange(4)):
+                array = [list(row) for row in zip(*array[::-1])]
+            if rng.random() < 0.5:
+                array = array[::-1]
+            tiles.append(
+                f"Tile {tile_ids[y * size + x]}:\n"
+                + "\n".join("".join("#" if p else "." for p in row) for row in array)
+            )
+    rng.shuffle(tiles)
+    corner_ids = [tile_ids[0], tile_ids[size - 1], tile_ids[-size], tile_ids[-1]]
+    return Generated(
+        "\n\n".join(tiles) + "\n",
+        {
+            "part1": reduce(lambda a, b: a * b, corner_ids),
+            "part2": sum(map(sum, image)) - snake_count * len(snake),
+        },
+    )
+
+
+GENERATORS: Dict[int, Callable[[random.Random, int], Generated]] = {
+    1: generate_01,
+    2: generate_02,
+    3: generate_03,
+    4: generate_04,
+    5: generate_05,
+    6: generate_06,
+    7: generate_07,
+    8: generate_08,
+    9: generate_09,
+    10: generate_10,
+    11: generate_11,
+    12: generate_12,
+    13: generate_13,
+    14: generate_14,
+    15: generate_15,
+    16: generate_16,
+    17: generate_17,
+    18: generate_18,
+    19: generate_19,
+    20: generate_20,
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> Generated:
+    return GENERATORS[day](random.Random(seed), size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic puzzle input.")
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("size", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="defaults to stdout")
+    arguments = parser.parse_args()
+
+    generated = generate(arguments.day, arguments.size, arguments.seed)
+    if arguments.output is None:
+        sys.stdout.write(generated.text)
+    else:
+        arguments.output.write_text(generated.text)
+    # exact answers of large inputs can exceed the default int to str limit
+    sys.set_int_max_str_digits(0)
+    print(json.dumps(generated.answers), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
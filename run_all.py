@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import List
+
+import aoc
+
+DAY_DIRECTORY = Path(__file__).parent
+
+
+@dataclass
+class DayResult:
+    name: str
+    output: str
+    wall_time: float
+    cpu_time: float
+
+
+def day_files(names: List[str]) -> List[Path]:
+    paths = sorted(DAY_DIRECTORY.glob("[0-9][0-9]*.py"))
+    if names:
+        paths = [path for path in paths if path.stem in names]
+    return paths
+
+
+def load_day(path: Path) -> ModuleType:
+    module_name = f"day_{path.stem}"
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    # registered so that pickle (used by aoc.cached_parse) can find its classes
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def cpu_time() -> float:
+    """CPU time of this process and of all its children that have finished."""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def run_day(path: Path) -> DayResult:
+    output = io.StringIO()
+    wall_start = time.perf_counter()
+    cpu_start = cpu_time()
+    with redirect_stdout(output):
+        load_day(path).main()
+    aoc.write_instrumentation_report(path.stem)
+    return DayResult(
+        path.stem,
+        output.getvalue(),
+        time.perf_counter() - wall_start,
+        cpu_time() - cpu_start,
+    )
+
+
+def main() -> None:
+    paths = day_files(sys.argv[1:])
+    results: List[DayResult] = []
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(os.cpu_count()) as executor:
+        futures = {executor.submit(run_day, path): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as error:
+                print(f"==================== {futures[future].stem} FAILED: {error!r}")
+                continue
+            results.append(result)
+            print(f"==================== {result.name}")
+            print(result.output, end="")
+    wall_time = time.perf_counter() - wall_start
+
+    print()
+    print(f"{'day':16} {'wall [s]':>10} {'cpu [s]':>10}")
+    for result in sorted(results, key=lambda result: result.name):
+        print(f"{result.name:16} {result.wall_time:10.3f} {result.cpu_time:10.3f}")
+    cpu_time = sum(result.cpu_time for result in results)
+    print(f"{'total':16} {wall_time:10.3f} {cpu_time:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import random
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from run_all import load_day
+
+xmas = load_day(Path(__file__).parent / "09.py")
+
+
+def brute_force_range(numbers: List[int], target: int) -> Optional[Tuple[int, int]]:
+    for stop in range(2, len(numbers) + 1):
+        for start in reversed(range(stop - 1)):
+            if sum(numbers[start:stop]) == target:
+                return start, stop
+    return None
+
+
+def check_random_ranges(low: int, high: int) -> None:
+    rng = random.Random(9)
+    for _ in range(5000):
+        numbers = [rng.randint(low, high) for _ in range(rng.randint(0, 10))]
+        target = rng.randint(3 * low, 3 * high)
+        assert xmas.find_range(numbers, target) == brute_force_range(numbers, target)
+
+
+def test_find_range_without_negative_numbers() -> None:
+    assert xmas.find_range([0, 1, 3, 4, 1], 4) == (1, 3)
+    assert xmas.find_range([0, 0, 0], 0) == (0, 2)
+    assert xmas.find_range([5, 1], 5) is None
+    check_random_ranges(0, 4)
+
+
+def test_find_range_with_negative_numbers() -> None:
+    assert xmas.find_range([4, -2, -2, -1], -1) == (0, 4)
+    assert xmas.find_range([-1, 3, -1], -1) is None
+    check_random_ranges(-4, 4)
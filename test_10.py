@@ -0,0 +1,31 @@
+import random
+from pathlib import Path
+
+from run_all import load_day
+
+adapters = load_day(Path(__file__).parent / "10.py")
+
+EXAMPLE = [28, 33, 18, 42, 31, 14, 46, 20, 48, 47, 24, 23, 49, 45, 19]
+EXAMPLE += [38, 39, 11, 1, 32, 25, 35, 8, 17, 7, 9, 4, 2, 34, 10, 3]
+
+
+def test_arrangement_count_of_example() -> None:
+    joltages = list(adapters.sorted_joltages(EXAMPLE))
+    assert adapters.jump_counts(joltages)[1:] == [22, 0, 10]
+    assert adapters.arrangement_count(joltages) == 19208
+
+
+def test_modular_arrangement_count_matches_exact_count() -> None:
+    rng = random.Random(10)
+    for _ in range(100):
+        joltage = 0
+        chain = []
+        for _ in range(rng.randint(0, 3000)):
+            joltage += rng.choice([1, 1, 2, 3])
+            chain.append(joltage)
+        joltages = list(adapters.sorted_joltages(chain))
+        exact = adapters.arrangement_count(joltages)
+        for modulus in [2, 1_000_000_007, 2**64]:
+            assert adapters.arrangement_count(joltages, modulus=modulus) == (
+                exact % modulus
+            )
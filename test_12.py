@@ -0,0 +1,49 @@
+import random
+from pathlib import Path
+from typing import List
+
+from run_all import load_day
+
+navigation = load_day(Path(__file__).parent / "12.py")
+
+
+def random_log(rng: random.Random) -> List[str]:
+    log = []
+    for _ in range(rng.randint(0, 40)):
+        action = rng.choice(navigation.ACTIONS)
+        value = (
+            rng.choice([90, 180, 270, 360]) if action in "LR" else rng.randint(0, 120)
+        )
+        log.append(f"{action}{value}")
+    return log
+
+
+def test_simulate_batch_matches_ship() -> None:
+    rng = random.Random(12)
+    logs = [random_log(rng) for _ in range(200)]
+    actions, values = navigation.pad_logs(logs)
+    headings = navigation.simulate_batch(actions, values, False, (1, 0))
+    waypoints = navigation.simulate_batch(actions, values, True, (10, 1))
+    for log, heading, waypoint in zip(logs, headings.tolist(), waypoints.tolist()):
+        ship = navigation.Ship(log)
+        ship.run()
+        assert heading == [ship.x, ship.y]
+        ship = navigation.Ship(log)
+        ship.run2()
+        assert waypoint == [ship.x, ship.y]
+
+
+def test_run_batch_reads_command_files(tmp_path: Path) -> None:
+    rng = random.Random(25)
+    paths = []
+    for index in range(5):
+        paths.append(tmp_path / f"{index}.txt")
+        paths[-1].write_text("".join(f"{command}\n" for command in random_log(rng)))
+    expected = []
+    for path in paths:
+        ship = navigation.Ship(path.read_text().split())
+        ship.run()
+        waypoint_ship = navigation.Ship(path.read_text().split())
+        waypoint_ship.run2()
+        expected.append((ship.manhattan_distance, waypoint_ship.manhattan_distance))
+    assert navigation.run_batch(paths) == expected